@@ -0,0 +1,93 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+import generate_texture_banner
+import layer_generator
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FIELDS = ("image", "trim", "car", "date")
+
+def load_catalog_manifest(manifest_path):
+    """Read catalog entries (image, trim, car, optional date) from a CSV or JSON manifest.
+
+    Image paths are resolved relative to the manifest's folder.
+    """
+    with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+        if manifest_path.lower().endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    entries = []
+    for line, row in enumerate(rows, start=1):
+        missing = [field for field in ("image", "trim", "car") if not row.get(field)]
+        if missing:
+            raise ValueError(f"Entry {line} of {manifest_path} is missing: {', '.join(missing)}")
+        entry = {field: (row.get(field) or "").strip() for field in MANIFEST_FIELDS}
+        entry["image"] = os.path.join(manifest_dir, entry["image"])
+        entries.append(entry)
+    return entries
+
+def init_worker(dark_texture, light_texture, font_path):
+    generate_texture_banner.DARK_TEXTURE_PATH = dark_texture
+    generate_texture_banner.LIGHT_TEXTURE_PATH = light_texture
+    generate_texture_banner.FONT_PATH = font_path
+
+def build_entry(entry, output_folder, output_format):
+    """Decode one reference image, overlay its banner and write its configurator layers.
+
+    Returns (image path, written file names, error message).
+    """
+    try:
+        img = Image.open(entry["image"]).convert("RGBA")
+        generate_texture_banner.draw_banner_overlay(img, entry["trim"], entry["car"], entry["date"] or None)
+        base_filename = os.path.splitext(os.path.basename(entry["image"]))[0]
+        return entry["image"], layer_generator.write_outputs(img, base_filename, output_folder, output_format), None
+    except Exception as e:
+        return entry["image"], [], str(e)
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Build the configurator catalog: banner overlay and layer extraction in one pass.")
+    parser.add_argument("manifest", help="CSV or JSON manifest with image, trim, car and optional date per entry.")
+    parser.add_argument("--output", default=layer_generator.OUTPUT_FOLDER,
+                        help=f"Folder to write catalog images to (default: {layer_generator.OUTPUT_FOLDER}).")
+    parser.add_argument("--format", choices=["layers", "labelmap", "cropped"], default="layers",
+                        help="Layer output format, as in layer_generator.py (default: layers).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count).")
+    parser.add_argument("--dark-texture", default=os.path.join(SCRIPT_DIR, "backgrounds", "metal_dark.png"),
+                        help="Banner background tile.")
+    parser.add_argument("--light-texture", default=os.path.join(SCRIPT_DIR, "backgrounds", "metal_light.png"),
+                        help="Text panel background tile.")
+    parser.add_argument("--font", default=os.path.join(SCRIPT_DIR, "EXEPixelPerfect.ttf"), help="Banner font.")
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    entries = load_catalog_manifest(args.manifest)
+    os.makedirs(args.output, exist_ok=True)
+
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(args.dark_texture, args.light_texture, args.font)) as executor:
+        results = executor.map(build_entry, entries, [args.output] * len(entries), [args.format] * len(entries))
+        failed = 0
+        for image_path, written, error in results:
+            if error is not None:
+                print(f"[ERROR] {image_path}: {error}")
+                failed += 1
+            else:
+                print(f"[CATALOG] {os.path.basename(image_path)}: {', '.join(written)}")
+
+    print(f"[SUMMARY] Built {len(entries) - failed} of {len(entries)} catalog entries "
+          f"in {time.time() - start_time:.2f} seconds.")
+    return 0 if failed == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
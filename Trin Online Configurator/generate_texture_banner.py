@@ -1,5 +1,6 @@
 import os
 from datetime import datetime
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 
 # Constants
@@ -16,8 +17,23 @@ FONT_PATH = "E:/Documents Global/Programmation/Trin/Trin Pack Creator/Trin Onlin
 
 CREATOR_NAME = "TheOddlySeagull"
 
-def tile_background(width, height, tile_image_path):
-    tile = Image.open(tile_image_path).convert("RGBA")
+# Cache sizes: a catalog run reuses a handful of widths and the same few panel texts
+BACKGROUND_CACHE_SIZE = 64
+PANEL_CACHE_SIZE = 512
+
+@lru_cache(maxsize=None)
+def load_texture(tile_image_path):
+    """Decode a background tile once per run. Treat the result as read-only."""
+    with Image.open(tile_image_path) as tile:
+        return tile.convert("RGBA")
+
+@lru_cache(maxsize=None)
+def load_font(font_path, font_size):
+    return ImageFont.truetype(font_path, font_size, layout_engine=ImageFont.Layout.BASIC)
+
+@lru_cache(maxsize=BACKGROUND_CACHE_SIZE)
+def _tiled_background(width, height, tile_image_path):
+    tile = load_texture(tile_image_path)
     tile_w, tile_h = tile.size
     bg = Image.new("RGBA", (width, height))
     for x in range(0, width, tile_w):
@@ -25,7 +41,12 @@ def tile_background(width, height, tile_image_path):
             bg.paste(tile, (x, y))
     return bg
 
+def tile_background(width, height, tile_image_path):
+    return _tiled_background(width, height, tile_image_path).copy()
+
+@lru_cache(maxsize=PANEL_CACHE_SIZE)
 def draw_text_panel(text, font, background_texture, padding=1):
+    """Render a bordered text panel. Results are memoized, so treat them as read-only."""
     dummy_img = Image.new("RGBA", (1, 1))
     draw_dummy = ImageDraw.Draw(dummy_img)
     text_bbox = draw_dummy.textbbox((0, 0), text, font=font)
@@ -34,7 +55,7 @@ def draw_text_panel(text, font, background_texture, padding=1):
 
     panel_w = text_w + padding
     panel_h = text_h + padding
-    panel_bg = tile_background(panel_w, panel_h, background_texture)
+    panel_bg = _tiled_background(panel_w, panel_h, background_texture)
 
     bordered_panel = Image.new("RGBA", (panel_w + 2, panel_h + 2), (0, 0, 0, 0))
     bordered_panel.paste((0, 0, 0), [0, 0, panel_w + 2, panel_h + 2])  # black border
@@ -71,7 +92,7 @@ def draw_fixed_color_panel(banner, base_img):
 
 def draw_banner_overlay(base_img, trim_name, car_name, banner_date=None):
     width = base_img.width
-    font = ImageFont.truetype(FONT_PATH, FONT_SIZE, layout_engine=ImageFont.Layout.BASIC)
+    font = load_font(FONT_PATH, FONT_SIZE)
 
     # Banner base
     banner = tile_background(width, BANNER_HEIGHT, DARK_TEXTURE_PATH)
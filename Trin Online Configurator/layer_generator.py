@@ -1,12 +1,17 @@
+import argparse
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from PIL import Image
 
-# Define input and output folders
+# Default input and output folders (override with --reference / --output)
 REFERENCE_FOLDER = "..\\Website\\reference"
 OUTPUT_FOLDER = "..\\Website\\output"
-
-# Ensure output folder exists
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+MANIFEST_NAME = ".layer_manifest.json"  # Kept in the output folder
+MANIFEST_VERSION = 1
 
 # Define color mappings
 REPLACE_COLORS = {
@@ -27,49 +32,280 @@ LAYER_COLORS = {
     "Paint4": (255, 0, 110),            # FF006E
 }
 
-def create_base_texture(img, base_filename):
-    base_img = img.copy()
-    base_pixels = base_img.load()
-    
-    for x in range(base_img.width):
-        for y in range(base_img.height):
-            r, g, b, a = base_pixels[x, y]
+def pack_rgb(rgb):
+    """Pack RGB values (tuples or the last axis of an array) into 24-bit integers."""
+    if isinstance(rgb, tuple):
+        r, g, b = rgb
+        return (r << 16) | (g << 8) | b
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+def image_from_array(template, array):
+    img = Image.fromarray(array)
+    img.info = template.info.copy()
+    return img
+
+def classify_pixels(rgba):
+    """Label each pixel with the index of its color in the sorted table of layer/replace colors.
+
+    Returns (table_keys, labels), where labels is -1 for pixels matching none of them.
+    """
+    table_keys = np.array(sorted({pack_rgb(c) for c in list(LAYER_COLORS.values()) + list(REPLACE_COLORS)}), dtype=np.uint32)
+    pixel_keys = pack_rgb(rgba[..., :3])
+    positions = np.minimum(np.searchsorted(table_keys, pixel_keys), len(table_keys) - 1)
+    labels = np.where(table_keys[positions] == pixel_keys, positions, -1)
+    return table_keys, labels
+
+def analyze_image(img):
+    """Classify the pixels of an RGBA image once and build its _Base texture.
+
+    Returns (rgba, base, labels, layer_labels): the source and base arrays, the
+    per-pixel labels from classify_pixels, and the label of every non-empty
+    layer keyed by name in LAYER_COLORS order.
+    """
+    rgba = np.asarray(img)
+    table_keys, labels = classify_pixels(rgba)
+    key_index = {int(key): index for index, key in enumerate(table_keys)}
+
+    # Replace only exact matches in REPLACE_COLORS, preserving alpha
+    replacements = np.zeros((len(table_keys), 3), dtype=np.uint8)
+    replaced = np.zeros(len(table_keys), dtype=bool)
+    for source_rgb, target_rgb in REPLACE_COLORS.items():
+        replacements[key_index[pack_rgb(source_rgb)]] = target_rgb
+        replaced[key_index[pack_rgb(source_rgb)]] = True
+    base = rgba.copy()
+    replace_mask = (labels >= 0) & replaced[labels]
+    base[replace_mask, :3] = replacements[labels[replace_mask]]
+
+    pixel_counts = np.bincount(labels[labels >= 0], minlength=len(table_keys))
+    layer_labels = {}
+    for layer_name, layer_color in LAYER_COLORS.items():
+        label = key_index[pack_rgb(layer_color)]
+        if pixel_counts[label] > 0:
+            layer_labels[layer_name] = label
+    return rgba, base, labels, layer_labels
+
+def extract_layers(img):
+    """Build the _Base texture and every non-empty layer of an RGBA image.
+
+    Pixels are classified once; the base replacement and each layer mask are
+    derived from those labels, and layers without matching pixels are never
+    allocated. Returns (base_img, {layer_name: layer_img}) in LAYER_COLORS order.
+    """
+    rgba, base, labels, layer_labels = analyze_image(img)
+    layers = {}
+    for layer_name, label in layer_labels.items():
+        layer = np.zeros_like(rgba)
+        layer_mask = labels == label
+        layer[layer_mask] = rgba[layer_mask]
+        layers[layer_name] = image_from_array(img, layer)
+    return image_from_array(img, base), layers
+
+def opaque_bounds(mask):
+    """(left, top, right, bottom) of the True pixels of a 2D mask, or None if there are none."""
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+def extract_cropped_layers(img):
+    """Like extract_layers, but each layer is trimmed to the bounding box of its opaque pixels.
+
+    Returns (base_img, {layer_name: (layer_img, (x, y))}) where (x, y) is the
+    offset of the crop inside the full texture. Layers whose matching pixels
+    are all fully transparent are left out.
+    """
+    rgba, base, labels, layer_labels = analyze_image(img)
+    opaque = rgba[..., 3] != 0
+    layers = {}
+    for layer_name, label in layer_labels.items():
+        layer_mask = labels == label
+        bounds = opaque_bounds(layer_mask & opaque)
+        if bounds is None:
+            continue
+        left, top, right, bottom = bounds
+        crop_mask = layer_mask[top:bottom, left:right]
+        layer = np.zeros((bottom - top, right - left, 4), dtype=np.uint8)
+        layer[crop_mask] = rgba[top:bottom, left:right][crop_mask]
+        layers[layer_name] = (image_from_array(img, layer), (left, top))
+    return image_from_array(img, base), layers
 
-            # Replace only if exact match in REPLACE_COLORS
-            if (r, g, b) in REPLACE_COLORS:
-                base_pixels[x, y] = (*REPLACE_COLORS[(r, g, b)], a)
-            else:
-                base_pixels[x, y] = (r, g, b, a)  # Preserve original
+def build_label_map(img):
+    """Build the _Base texture and a palette-mode label map of all layers.
 
-    base_img.save(os.path.join(OUTPUT_FOLDER, f"{base_filename}_Base.png"))
+    Each label-map pixel stores the 1-based index of its layer in LAYER_COLORS
+    (0 for none). A layer mask is rebuilt by taking the legend color wherever
+    the label matches, with the alpha of the _Base texture. Returns
+    (base_img, label_img, legend entries for the non-empty layers).
+    """
+    rgba, base, labels, layer_labels = analyze_image(img)
+    label_map = np.zeros(labels.shape, dtype=np.uint8)
+    legend = []
+    for index, (layer_name, layer_color) in enumerate(LAYER_COLORS.items(), start=1):
+        if layer_name not in layer_labels:
+            continue
+        layer_mask = labels == layer_labels[layer_name]
+        label_map[layer_mask] = index
+        legend.append({"index": index, "name": layer_name, "color": "#{:02X}{:02X}{:02X}".format(*layer_color),
+                       "pixels": int(layer_mask.sum())})
 
+    label_img = Image.frombytes("P", img.size, label_map.tobytes())
+    # The palette only makes the file viewable; the configurator reads the indices.
+    label_img.putpalette([0, 0, 0] + [c for color in LAYER_COLORS.values() for c in color])
+    label_img.info["transparency"] = 0
+    return image_from_array(img, base), label_img, legend
 
+def write_outputs(img, base_filename, output_folder, output_format="layers"):
+    """Write the outputs of one decoded RGBA reference image; returns the file names written.
 
-def process_image(image_path):
+    "layers" writes the base texture plus one RGBA PNG per non-empty layer;
+    "labelmap" writes the base texture, one palette PNG label map and its JSON legend;
+    "cropped" writes the base texture, each non-empty layer trimmed to its opaque
+    pixels, and a JSON manifest of the crop offsets.
+    """
+    if output_format == "labelmap":
+        base_img, label_img, legend = build_label_map(img)
+        written = [f"{base_filename}_Base.png", f"{base_filename}_Labels.png", f"{base_filename}_Labels.json"]
+        base_img.save(os.path.join(output_folder, written[0]))
+        label_img.save(os.path.join(output_folder, written[1]), optimize=True)
+        with open(os.path.join(output_folder, written[2]), "w", encoding="utf-8") as f:
+            json.dump({"base": written[0], "labels": written[1], "width": img.width, "height": img.height,
+                       "layers": legend}, f, indent=4)
+        return written
+
+    if output_format == "cropped":
+        base_img, layers = extract_cropped_layers(img)
+        written = [f"{base_filename}_Base.png"]
+        base_img.save(os.path.join(output_folder, written[0]))
+        offsets = {}
+        for layer_name, (layer_img, (x, y)) in layers.items():
+            written.append(f"{base_filename}_{layer_name}.png")
+            layer_img.save(os.path.join(output_folder, written[-1]))
+            offsets[layer_name] = {"file": written[-1], "x": x, "y": y, "width": layer_img.width, "height": layer_img.height}
+        written.append(f"{base_filename}_Layers.json")
+        with open(os.path.join(output_folder, written[-1]), "w", encoding="utf-8") as f:
+            json.dump({"base": written[0], "width": img.width, "height": img.height, "layers": offsets}, f, indent=4)
+        return written
+
+    base_img, layers = extract_layers(img)
+    written = [f"{base_filename}_Base.png"]
+    base_img.save(os.path.join(output_folder, written[0]))
+    for layer_name, layer_img in layers.items():
+        written.append(f"{base_filename}_{layer_name}.png")
+        layer_img.save(os.path.join(output_folder, written[-1]))
+    return written
+
+def process_image(image_path, output_folder=None, output_format="layers"):
+    """Write the outputs of one reference image file; returns the file names written."""
     img = Image.open(image_path).convert("RGBA")
     base_filename = os.path.splitext(os.path.basename(image_path))[0]
+    return write_outputs(img, base_filename, output_folder or OUTPUT_FOLDER, output_format)
 
-    create_base_texture(img, base_filename)
+def process_reference(image_path, output_folder, output_format="layers"):
+    """Pool task: returns (image_path, written file names, error message)."""
+    try:
+        return image_path, process_image(image_path, output_folder, output_format), None
+    except Exception as e:
+        return image_path, [], str(e)
 
-    for layer_name, layer_color in LAYER_COLORS.items():
-        layer_img = img.copy()
-        layer_pixels = layer_img.load()
-        has_matching_pixels = False
-        for x in range(img.width):
-            for y in range(img.height):
-                if layer_pixels[x, y][:3] != layer_color:
-                    layer_pixels[x, y] = (0, 0, 0, 0)
-                else:
-                    has_matching_pixels = True
-        if has_matching_pixels:
-            layer_img.save(os.path.join(OUTPUT_FOLDER, f"{base_filename}_{layer_name}.png"))
+# === Incremental Manifest ===
+def hash_file(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def settings_hash(output_format="layers"):
+    payload = json.dumps([list(LAYER_COLORS.items()), sorted(REPLACE_COLORS.items()), output_format])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def load_manifest(output_folder):
+    try:
+        with open(os.path.join(output_folder, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("entries", {})
+
+def save_manifest(output_folder, entries):
+    manifest_path = os.path.join(output_folder, MANIFEST_NAME)
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "entries": entries}, f, indent=1, sort_keys=True)
+    os.replace(manifest_path + ".tmp", manifest_path)
 
+def is_up_to_date(entry, image_path, output_folder, current_settings):
+    if not entry or entry.get("settings") != current_settings:
+        return False
+    if not all(os.path.exists(os.path.join(output_folder, name)) for name in entry.get("outputs", [])):
+        return False
+    st = os.stat(image_path)
+    if st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns"):
+        return True
+    if hash_file(image_path) != entry.get("sha1"):
+        return False
+    entry["size"], entry["mtime_ns"] = st.st_size, st.st_mtime_ns
+    return True
+
+def remove_stale_outputs(entry, written, output_folder):
+    """Delete layers a previous run wrote for this reference but that are now empty."""
+    if not entry:
+        return
+    for name in set(entry.get("outputs", [])) - set(written):
+        try:
+            os.remove(os.path.join(output_folder, name))
+        except FileNotFoundError:
+            pass
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Generate configurator layers from reference textures.")
+    parser.add_argument("--reference", default=REFERENCE_FOLDER, help=f"Folder of reference textures (default: {REFERENCE_FOLDER}).")
+    parser.add_argument("--output", default=OUTPUT_FOLDER, help=f"Folder to write layers to (default: {OUTPUT_FOLDER}).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count; 1 processes in this process).")
+    parser.add_argument("--format", choices=["layers", "labelmap", "cropped"], default="layers",
+                        help="Write one RGBA PNG per layer, one palette label map plus a JSON legend, "
+                             "or per-layer PNGs cropped to their opaque pixels plus an offset manifest (default: layers).")
+    parser.add_argument("--force", action="store_true", help=f"Regenerate every image, ignoring {MANIFEST_NAME}.")
+    return parser.parse_args()
 
 def main():
-    # Process all images in the reference folder
-    for filename in os.listdir(REFERENCE_FOLDER):
-        if filename.lower().endswith((".png", ".jpg", ".jpeg")):
-            process_image(os.path.join(REFERENCE_FOLDER, filename))
+    args = parse_arguments()
+    os.makedirs(args.output, exist_ok=True)
+
+    image_paths = [os.path.join(args.reference, filename) for filename in sorted(os.listdir(args.reference))
+                   if filename.lower().endswith((".png", ".jpg", ".jpeg"))]
+    manifest = {} if args.force else load_manifest(args.output)
+    current_settings = settings_hash(args.format)
+    stale = [image_path for image_path in image_paths
+             if not is_up_to_date(manifest.get(os.path.basename(image_path)), image_path, args.output, current_settings)]
+
+    start_time = time.time()
+    if args.workers > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(process_reference, stale, [args.output] * len(stale), [args.format] * len(stale)))
+    else:
+        results = [process_reference(image_path, args.output, args.format) for image_path in stale]
+
+    failed = 0
+    for image_path, written, error in results:
+        key = os.path.basename(image_path)
+        if error is not None:
+            print(f"[ERROR] {key}: {error}")
+            manifest.pop(key, None)
+            failed += 1
+            continue
+        remove_stale_outputs(manifest.get(key), written, args.output)
+        st = os.stat(image_path)
+        manifest[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": hash_file(image_path),
+                         "settings": current_settings, "outputs": written}
+        print(f"[LAYERS] {key}: {', '.join(written)}")
+    for key in set(manifest) - {os.path.basename(image_path) for image_path in image_paths}:
+        del manifest[key]
+    save_manifest(args.output, manifest)
+
+    print(f"[SUMMARY] Processed {len(stale) - failed}, failed {failed}, up to date {len(image_paths) - len(stale)} "
+          f"in {time.time() - start_time:.2f} seconds.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,8 +1,10 @@
 import argparse
-import json
 import os
 from typing import Any, Dict, List
 
+from json_io import load_json, write_summary
+from json_patch import write_json_patch
+
 
 TARGET_VARIABLES = {"rlBodyroll", "rrBodyroll", "flBodyroll", "frBodyroll"}
 VISIBILITY_SNIPPET = {
@@ -13,16 +15,10 @@ VISIBILITY_SNIPPET = {
 }
 
 
-def load_json(path: str) -> Any:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def save_json(path: str, data: Any) -> None:
-    # Preserve a readable, consistent formatting without trailing spaces.
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-        f.write("\n")
+def save_json(path: str, data: Any) -> bool:
+    # Splice the new animations into the original text so its layout and comments survive.
+    # Returns False when the file already held exactly these bytes.
+    return write_json_patch(path, data, ensure_ascii=False)
 
 
 def ensure_visibility_animation(modifier: Dict[str, Any]) -> bool:
@@ -48,12 +44,11 @@ def ensure_visibility_animation(modifier: Dict[str, Any]) -> bool:
     return True
 
 
-def process_file(path: str) -> bool:
-    try:
-        data = load_json(path)
-    except Exception:
-        return False
-
+def add_visibility_animations(data: Any) -> bool:
+    """
+    Adds the visibility animation to every bodyroll modifier of a parsed definition.
+    Returns True if the document changed.
+    """
     if not isinstance(data, dict):
         return False
 
@@ -69,11 +64,18 @@ def process_file(path: str) -> bool:
         if var_name in TARGET_VARIABLES:
             if ensure_visibility_animation(modifier):
                 changed = True
+    return changed
+
+
+def process_file(path: str) -> bool:
+    try:
+        data = load_json(path)
+    except Exception:
+        return False
 
-    if changed:
+    if add_visibility_animations(data):
         try:
-            save_json(path, data)
-            return True
+            return save_json(path, data)
         except Exception:
             return False
     return False
@@ -113,6 +115,7 @@ def main() -> None:
             skipped += 1
 
     print(f"Done. Modified {modified} files. Skipped {skipped} files.")
+    print(f"Writes: {write_summary()}.")
 
 
 if __name__ == "__main__":
@@ -11,6 +11,9 @@ Rules:
  - Insert new connection: {"type": "tow_flatbed", "pos": [0.0, Y, Z], "distance": 2.0}.
  - Skip any *_heavy variants entirely (tow_bumper_heavy, tow_wheel_heavy, tow_flatbed_heavy).
  - Create an optional backup of modified files.
+ - Write by splicing the new connection into the original text, so comments and formatting survive.
+ - With --index, refresh the structural index (vehicle_index.py) and parse only the files it
+   lists as candidates instead of every JSON under the root.
 
 Edge cases handled:
  - Missing HOOKUP group: file skipped with warning.
@@ -26,49 +29,12 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-import re
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-
-COMMENT_BLOCK_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
-COMMENT_LINE_RE = re.compile(r"(?m)(^|\s)//.*?$")
-
-
-def strip_json_comments(text: str) -> str:
-    """Remove // line comments and /* */ block comments from JSON-like text.
-    Attempts to avoid stripping sequences inside string literals by a simplistic approach:
-    It first removes block comments, then line comments not inside quotes.
-    This is not a perfect JSON-with-comments parser but should suffice for typical asset files.
-    """
-    # Remove block comments
-    text = COMMENT_BLOCK_RE.sub("", text)
-
-    # For line comments, we process line by line and skip if inside quotes roughly.
-    cleaned_lines: List[str] = []
-    for line in text.splitlines():
-        # Quick heuristic: if '//' appears, remove from first occurrence not inside a quoted string.
-        if "//" in line:
-            new_line = []
-            in_string = False
-            escape = False
-            i = 0
-            while i < len(line):
-                ch = line[i]
-                if ch == '"' and not escape:
-                    in_string = not in_string
-                if not in_string and ch == '/' and i + 1 < len(line) and line[i + 1] == '/':
-                    # start of comment outside string
-                    break
-                new_line.append(ch)
-                escape = (ch == '\\' and not escape)
-                if ch != '\\':
-                    escape = False if escape else escape
-                i += 1
-            cleaned_lines.append(''.join(new_line))
-        else:
-            cleaned_lines.append(line)
-    return '\n'.join(cleaned_lines)
+import vehicle_index
+from json_io import strip_json_comments, write_summary
+from json_patch import write_json_patch
 
 
 def load_json(path: Path) -> Optional[Dict[str, Any]]:
@@ -144,29 +110,43 @@ def add_tow_flatbed(hookup: Dict[str, Any], y_value: float, z_value: float) -> b
     return True
 
 
-def process_file(path: Path, write: bool, backup_ext: Optional[str], strict: bool) -> bool:
-    data = load_json(path)
-    if data is None:
-        return False
-    hookup = find_hookup_group(data)
+def plan_tow_flatbed(data: Any) -> Tuple[Optional[Dict[str, Any]], float, float, Optional[str]]:
+    """Locate the HOOKUP group and derive the flatbed Y/Z for a parsed definition.
+
+    Returns (hookup, y, z, None), or (None, 0.0, 0.0, reason) when the file should be skipped.
+    """
+    hookup = find_hookup_group(data) if isinstance(data, dict) else None
     if hookup is None:
-        print(f"[SKIP] No HOOKUP group: {path}")
-        return False
+        return None, 0.0, 0.0, "No HOOKUP group"
     if already_has_flatbed(hookup):
-        print(f"[SKIP] Already has tow_flatbed: {path}")
-        return False
+        return None, 0.0, 0.0, "Already has tow_flatbed"
     wheel_positions = extract_positions(hookup, "tow_wheel")
     if not wheel_positions:
-        print(f"[SKIP] No non-heavy tow_wheel found: {path}")
-        return False
+        return None, 0.0, 0.0, "No non-heavy tow_wheel found"
     bumper_positions = extract_positions(hookup, "tow_bumper")
     if not bumper_positions:
-        print(f"[SKIP] No non-heavy tow_bumper found: {path}")
-        return False
+        return None, 0.0, 0.0, "No non-heavy tow_bumper found"
     # Derive Y from first tow_wheel (consistent with requirement)
     y_value = wheel_positions[0][1]
     # Derive Z from maximum Z among tow_bumper
     z_value = max(p[2] for p in bumper_positions)
+    return hookup, y_value, z_value, None
+
+
+def insert_tow_flatbed(data: Any) -> bool:
+    """Add the tow_flatbed connection to a parsed definition in place; True if it changed."""
+    hookup, y_value, z_value, _ = plan_tow_flatbed(data)
+    return hookup is not None and add_tow_flatbed(hookup, y_value, z_value)
+
+
+def process_file(path: Path, write: bool, backup_ext: Optional[str], strict: bool) -> bool:
+    data = load_json(path)
+    if data is None:
+        return False
+    hookup, y_value, z_value, skip_reason = plan_tow_flatbed(data)
+    if hookup is None:
+        print(f"[SKIP] {skip_reason}: {path}")
+        return False
     changed = add_tow_flatbed(hookup, y_value, z_value)
     if not changed:
         print(f"[FAIL] Could not modify connections: {path}")
@@ -182,7 +162,8 @@ def process_file(path: Path, write: bool, backup_ext: Optional[str], strict: boo
                     raise RuntimeError(msg)
                 print(msg)
         try:
-            path.write_text(json.dumps(data, indent=4, ensure_ascii=False) + "\n", encoding="utf-8")
+            # Only the new connection is spliced in; comments and formatting are kept.
+            write_json_patch(path, data, ensure_ascii=False)
         except Exception as e:
             msg = f"[ERROR] Failed to write {path}: {e}"
             if strict:
@@ -206,6 +187,9 @@ def main(argv: List[str]) -> int:
     parser.add_argument("--backup-ext", default=".bak", help="Extension for backup copy (set to empty string to disable).")
     parser.add_argument("--strict", action="store_true", help="Raise on errors instead of continuing.")
     parser.add_argument("--limit", type=int, default=0, help="Process only first N JSON files (debug).")
+    parser.add_argument("--index", action="store_true",
+                        help=f"Select candidate files from the structural index (<root>/{vehicle_index.DB_NAME}), "
+                             "updating it first.")
     args = parser.parse_args(argv)
 
     root_path = Path(args.root).resolve()
@@ -216,7 +200,19 @@ def main(argv: List[str]) -> int:
         print(f"[ERROR] Root path is not a directory: {root_path}")
         return 2
 
-    files = iter_json_files(root_path)
+    if args.index:
+        conn = vehicle_index.open_index(root_path / vehicle_index.DB_NAME)
+        try:
+            stats = vehicle_index.update_index(conn, root_path)
+            candidates = vehicle_index.tow_flatbed_candidates(conn)
+        finally:
+            conn.close()
+        indexed = sum(stats.values()) - stats["removed"]
+        print(f"[INFO] Index selected {len(candidates)} of {indexed} JSON files "
+              f"({stats['rescanned'] + stats['failed']} reparsed)")
+        files = [root_path / key for key in candidates]
+    else:
+        files = iter_json_files(root_path)
     if args.limit > 0:
         files = files[:args.limit]
     print(f"[INFO] Scanning {len(files)} JSON files under {root_path}")
@@ -234,6 +230,8 @@ def main(argv: List[str]) -> int:
             if args.strict:
                 raise
     print(f"[SUMMARY] Modified files: {modified}; Unmodified/skipped: {len(files) - modified}")
+    if write_changes:
+        print(f"[SUMMARY] Writes: {write_summary()}")
     return 0
 
 
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Color-map scaling benchmark for the specular color matcher.
+
+Builds seeded random color maps of growing size and times single-color
+lookups through the linear map_pixel_color scan and through the indexed
+ColorEngine.classify, checking that both agree on every sample. The indexed
+matcher should stay roughly flat as the map grows to 1000 entries.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import generate_specular_maps as specular  # noqa: E402
+
+
+def random_color_map(rng: random.Random, size: int) -> Dict[str, str]:
+    outputs = ["#FFFFFF", "#999999", "#808080", "#0C0C0C"]
+    color_map: Dict[str, str] = {}
+    while len(color_map) < size:
+        color_map[specular.rgb_to_hex(tuple(rng.randrange(256) for _ in range(3)))] = rng.choice(outputs)
+    return color_map
+
+
+def sample_pixels(rng: random.Random, color_map: Dict[str, str], tolerance: int, count: int) -> List[tuple]:
+    sources = [specular.hex_to_rgb(k) for k in color_map]
+    pixels = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            base = rng.choice(sources)
+            pixels.append(tuple(max(0, min(255, c + rng.randint(-tolerance, tolerance))) for c in base))
+        else:
+            pixels.append(tuple(rng.randrange(256) for _ in range(3)))
+    return pixels
+
+
+def time_per_lookup(fn, pixels: List[tuple]) -> float:
+    start = time.perf_counter()
+    for pixel in pixels:
+        fn(pixel)
+    return (time.perf_counter() - start) / len(pixels) * 1e6
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark color matching as the color map grows.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[38, 100, 250, 500, 1000], help="Color map sizes to test.")
+    parser.add_argument("--tolerance", type=int, default=3, help="Noise tolerance (default: 3).")
+    parser.add_argument("--samples", type=int, default=5000, help="Lookups per size (default: 5000).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    parser.add_argument("--output", help="Optional JSON file for the results.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    results = {}
+    print(f"{'entries':>8}  {'linear us/lookup':>17}  {'indexed us/lookup':>18}")
+    for size in args.sizes:
+        color_map = random_color_map(rng, size)
+        pixels = sample_pixels(rng, color_map, args.tolerance, args.samples)
+        specular.COLOR_MAP, specular.NOISE_TOLERANCE = color_map, args.tolerance
+        engine = specular.ColorEngine(color_map, specular.DEFAULT_COLOR, args.tolerance)
+
+        mismatches = [p for p in pixels if engine.map_rgb(p) != specular.map_pixel_color(p)]
+        if mismatches:
+            print(f"[FAIL] {len(mismatches)} lookups disagree at {size} entries, e.g. {mismatches[0]}")
+            return 1
+
+        linear = time_per_lookup(specular.map_pixel_color, pixels)
+        indexed = time_per_lookup(engine.classify, pixels)
+        results[size] = {"linear_us": round(linear, 3), "indexed_us": round(indexed, 3)}
+        print(f"{size:>8}  {linear:>17.2f}  {indexed:>18.2f}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"tolerance": args.tolerance, "results": results}, indent=4) + "\n",
+                                     encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the comment-tolerant JSON loader.
+
+Builds seeded synthetic vehicle JSONs, annotates some of them with line and
+block comments (including comment markers inside strings), and measures how
+many MB/s json_io.strip_json_comments gets through compared with the
+per-line stripper validate_json used before. Comment-free documents exercise
+the no-slash fast path. Every stripped document must parse to the same value
+as the uncommented original.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import json_io  # noqa: E402
+from synthetic_assets import build_vehicle, load_paint_buckets  # noqa: E402
+
+LEGACY_BLOCK_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+
+def legacy_strip_json_comments(text: str) -> str:
+    """The regex-plus-per-line-loop stripper validate_json used before json_io."""
+    text = LEGACY_BLOCK_RE.sub("", text)
+    out_lines: List[str] = []
+    for line in text.splitlines():
+        if "//" not in line:
+            out_lines.append(line)
+            continue
+        new_line_chars: List[str] = []
+        in_string = False
+        escape = False
+        i = 0
+        while i < len(line):
+            ch = line[i]
+            if ch == '"' and not escape:
+                in_string = not in_string
+            if not in_string and ch == '/' and i + 1 < len(line) and line[i + 1] == '/':
+                break
+            new_line_chars.append(ch)
+            escape = ch == '\\' and not escape
+            i += 1
+        out_lines.append(''.join(new_line_chars))
+    return "\n".join(out_lines)
+
+
+def annotate(rng: random.Random, text: str) -> str:
+    """Sprinkle // and /* */ comments between lines of a pretty-printed document."""
+    lines = []
+    for line in text.splitlines():
+        roll = rng.random()
+        if roll < 0.05:
+            line += "  // tuned by hand, see https://example.com/notes"
+        elif roll < 0.08:
+            lines.append("/* block comment with \"quotes\" and // slashes */")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def throughput(fn: Callable[[str], str], documents: List[str], repeat: int) -> float:
+    size = sum(len(doc) for doc in documents)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in documents:
+            fn(doc)
+        best = min(best, time.perf_counter() - start)
+    return size / best / 1e6
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark comment stripping throughput.")
+    parser.add_argument("--documents", type=int, default=200, help="Synthetic documents per case (default: 200).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case; the best is kept (default: 5).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    parser.add_argument("--output", help="Optional JSON file for the results.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    paint_buckets = load_paint_buckets()
+    originals = [build_vehicle(rng, f"bench_{i}", paint_buckets) for i in range(args.documents)]
+    # Paint bucket ids carry no slashes, so give a few strings one to keep the fast path honest.
+    for data in originals[::4]:
+        data["general"]["description"] = "see docs/vehicles /* not a comment */ // nor this"
+    plain = [json.dumps(data, indent=4) for data in originals if "/" not in json.dumps(data)]
+    commented = [annotate(rng, json.dumps(data, indent=4)) for data in originals]
+
+    for doc, data in zip(commented, originals):
+        if json_io.loads(doc) != data:
+            print("[FAIL] json_io.strip_json_comments changed the parsed document")
+            return 1
+
+    results = {}
+    print(f"{'case':>10}  {'docs':>5}  {'legacy MB/s':>12}  {'json_io MB/s':>13}")
+    for case, documents in (("plain", plain), ("commented", commented)):
+        legacy = throughput(legacy_strip_json_comments, documents, args.repeat)
+        shared = throughput(json_io.strip_json_comments, documents, args.repeat)
+        results[case] = {"documents": len(documents), "legacy_mb_s": round(legacy, 2), "json_io_mb_s": round(shared, 2)}
+        print(f"{case:>10}  {len(documents):>5}  {legacy:>12.2f}  {shared:>13.2f}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=4) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Cost and correctness check for json_patch's splicing writer.
+
+Builds seeded synthetic vehicle JSONs written as json.dumps(indent=4) does,
+applies the edits the maintenance scripts make (append an array item, append
+an object member, change a scalar), and times json_patch.patch_text against a
+full json.dumps rewrite. On these canonical documents both must produce the
+same text, so any layout drift in the patcher fails the run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from json_patch import patch_text  # noqa: E402
+from synthetic_assets import build_vehicle, load_paint_buckets  # noqa: E402
+
+
+def append_connection(data: Dict[str, Any]) -> None:
+    data["connectionGroups"][0]["connections"].append({"type": "tow_flatbed", "pos": [0.0, 0.5, -3.1], "distance": 2.0})
+
+
+def append_member(data: Dict[str, Any]) -> None:
+    # Object members, nested and top-level, including container values.
+    data["general"]["damage"] = {"totaled": True, "parts": [1, 2]}
+    data["rendering"]["animatedObjects"][0]["notes"] = "added"
+
+
+def change_scalar(data: Dict[str, Any]) -> None:
+    data["general"]["health"] = 250
+
+
+EDITS: Dict[str, Callable[[Dict[str, Any]], None]] = {
+    "append_item": append_connection,
+    "append_member": append_member,
+    "change_scalar": change_scalar,
+}
+
+
+def best_time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark and check json_patch against full rewrites.")
+    parser.add_argument("--documents", type=int, default=200, help="Synthetic documents per edit (default: 200).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per edit; the best is kept (default: 5).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    parser.add_argument("--output", help="Optional JSON file for the results.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    paint_buckets = load_paint_buckets()
+    originals = [build_vehicle(rng, f"bench_{i}", paint_buckets) for i in range(args.documents)]
+
+    results = {}
+    print(f"{'edit':>14}  {'docs':>5}  {'json.dumps ms':>14}  {'patch_text ms':>14}")
+    for name, edit in EDITS.items():
+        cases: List[Tuple[str, Any]] = []
+        for data in originals:
+            edited = copy.deepcopy(data)
+            edit(edited)
+            cases.append((json.dumps(data, indent=4), edited))
+
+        for text, edited in cases:
+            if patch_text(text, edited) != json.dumps(edited, indent=4):
+                print(f"[FAIL] {name}: patch_text differs from json.dumps(indent=4)")
+                return 1
+
+        rewrite = best_time(lambda: [json.dumps(edited, indent=4) for _, edited in cases], args.repeat)
+        patched = best_time(lambda: [patch_text(text, edited) for text, edited in cases], args.repeat)
+        results[name] = {"documents": len(cases), "dumps_ms": round(rewrite * 1000, 2),
+                         "patch_ms": round(patched * 1000, 2)}
+        print(f"{name:>14}  {len(cases):>5}  {rewrite * 1000:>14.2f}  {patched * 1000:>14.2f}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=4) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
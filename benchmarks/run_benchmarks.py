@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Repeatable benchmarks for the Trin Pack Creator scripts.
+
+Each benchmark runs one script as a subprocess against a fresh copy of a
+synthetic asset tree (see synthetic_assets.py), so mutating scripts always see
+the same input. Copying the tree and any setup command are not timed; script
+stdout is discarded so console speed does not skew results.
+
+Results are written as JSON. Pass --baseline with an earlier results file to
+flag benchmarks whose median time regressed by more than --threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic_assets import assets_root, generate_tree  # noqa: E402
+
+# name -> (argv builder, optional untimed setup argv builder); builders receive the tree root.
+ArgvBuilder = Callable[[Path], List[str]]
+BENCHMARKS: Dict[str, Tuple[ArgvBuilder, Optional[ArgvBuilder]]] = {
+    "generate_specular_maps": (
+        lambda root: ["generate_specular_maps.py", "--base-path", str(root), "--noise-tolerance", "3"],
+        None,
+    ),
+    "generate_specular_maps_workers": (
+        lambda root: ["generate_specular_maps.py", "--base-path", str(root), "--noise-tolerance", "3", "--workers"],
+        None,
+    ),
+    "generate_specular_maps_incremental_noop": (
+        lambda root: ["generate_specular_maps.py", "--base-path", str(root), "--noise-tolerance", "3", "--incremental"],
+        lambda root: ["generate_specular_maps.py", "--base-path", str(root), "--noise-tolerance", "3", "--incremental"],
+    ),
+    "validate_json": (
+        lambda root: ["validate_json.py", str(assets_root(root))],
+        None,
+    ),
+    "validate_json_cached": (
+        lambda root: ["validate_json.py", str(assets_root(root))],
+        lambda root: ["validate_json.py", str(assets_root(root))],
+    ),
+    "validate_json_jobs": (
+        lambda root: ["validate_json.py", str(assets_root(root)), "--jobs", str(os.cpu_count() or 1)],
+        None,
+    ),
+    "add_tow_flatbed": (
+        lambda root: ["add_tow_flatbed.py", str(assets_root(root)), "--backup-ext", ""],
+        None,
+    ),
+    "add_tow_flatbed_index": (
+        lambda root: ["add_tow_flatbed.py", str(assets_root(root)), "--backup-ext", "", "--index"],
+        lambda root: ["vehicle_index.py", "update", str(assets_root(root))],
+    ),
+    "add_bodyroll_visibility": (
+        lambda root: ["add_bodyroll_visibility.py", str(assets_root(root))],
+        None,
+    ),
+    "vehicle_damager": (
+        lambda root: ["vehicle_damager.py", "--folder_path", str(assets_root(root))],
+        None,
+    ),
+    "vehicle_damager_jobs": (
+        lambda root: ["vehicle_damager.py", "--folder_path", str(assets_root(root)), "--jobs", str(os.cpu_count() or 1),
+                      "--quiet"],
+        None,
+    ),
+    "replace_material_entries": (
+        lambda root: ["replace_material_entries.py", "--target", str(assets_root(root)),
+                      "--mapping", str(REPO_ROOT / "paint_replacements.json")],
+        None,
+    ),
+    "vehicle_pipeline": (
+        lambda root: ["vehicle_pipeline.py", str(assets_root(root)), "--passes", "damage", "bodyroll", "tow_flatbed",
+                      "upholstery", "materials", "--mapping", str(REPO_ROOT / "paint_replacements.json")],
+        None,
+    ),
+    "generate_item_models": (
+        lambda root: ["generate_item_models.py", "--base-path", str(root)],
+        None,
+    ),
+}
+
+
+def run_script(argv: List[str]) -> float:
+    command = [sys.executable, str(REPO_ROOT / argv[0])] + argv[1:]
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} exited with {completed.returncode}:\n{completed.stderr}")
+    return elapsed
+
+
+def run_benchmark(name: str, template: Path, workdir: Path, repeat: int) -> Dict[str, object]:
+    build_argv, setup_argv = BENCHMARKS[name]
+    timings: List[float] = []
+    for _ in range(repeat):
+        tree = workdir / "run"
+        if tree.exists():
+            shutil.rmtree(tree)
+        shutil.copytree(template, tree)
+        if setup_argv is not None:
+            run_script(setup_argv(tree))
+        timings.append(run_script(build_argv(tree)))
+    return {
+        "runs": [round(t, 4) for t in timings],
+        "min": round(min(timings), 4),
+        "median": round(statistics.median(timings), 4),
+    }
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, object]], baseline_path: Path, threshold: float) -> List[str]:
+    with baseline_path.open("r", encoding="utf-8") as handle:
+        baseline = json.load(handle).get("results", {})
+    regressions: List[str] = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            print(f"[BASELINE] {name}: no baseline entry")
+            continue
+        ratio = result["median"] / previous["median"] if previous["median"] else float("inf")
+        status = "REGRESSION" if ratio > 1.0 + threshold else "ok"
+        print(f"[BASELINE] {name}: {previous['median']:.4f}s -> {result['median']:.4f}s (x{ratio:.2f}) {status}")
+        if status == "REGRESSION":
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pack scripts on a synthetic asset tree.")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run only these benchmarks.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (default: 3).")
+    parser.add_argument("--packs", type=int, default=2, help="Packs in the synthetic tree (default: 2).")
+    parser.add_argument("--vehicles", type=int, default=200, help="Vehicle JSONs per pack (default: 200).")
+    parser.add_argument("--skins", type=int, default=100, help="Skin PNGs per pack (default: 100).")
+    parser.add_argument("--size", type=int, default=256, help="Skin width and height in pixels (default: 256).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic tree (default: 0).")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write results (default: benchmark_results.json).")
+    parser.add_argument("--baseline", help="Earlier results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed median slowdown before flagging a regression (default: 0.15).")
+    parser.add_argument("--workdir", help="Directory for the synthetic trees (default: a temporary directory).")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    tree_params = {"packs": args.packs, "vehicles": args.vehicles, "skins": args.skins, "size": args.size, "seed": args.seed}
+
+    with tempfile.TemporaryDirectory(prefix="trin_bench_") as temp_dir:
+        workdir = Path(args.workdir) if args.workdir else Path(temp_dir)
+        template = workdir / "template"
+        if template.exists():
+            shutil.rmtree(template)
+        counts = generate_tree(template, **tree_params)
+        print(f"[INFO] Synthetic tree: {counts}")
+
+        results: Dict[str, Dict[str, object]] = {}
+        for name in names:
+            results[name] = run_benchmark(name, template, workdir, args.repeat)
+            print(f"[BENCH] {name}: median {results[name]['median']:.4f}s  min {results[name]['min']:.4f}s")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "tree": tree_params,
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=4) + "\n", encoding="utf-8")
+    print(f"[INFO] Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, Path(args.baseline), args.threshold)
+        if regressions:
+            print(f"[SUMMARY] Regressions: {', '.join(regressions)}")
+            return 1
+        print("[SUMMARY] No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
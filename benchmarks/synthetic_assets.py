@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Generate a synthetic Immersive Vehicles asset tree for benchmarking.
+
+The tree mirrors a real pack checkout:
+
+    <root>/mccore/src/main/resources/assets/<pack>/jsondefs/vehicles/<category>/*.json
+    <root>/mccore/src/main/resources/assets/<pack>/textures/vehicles/*.png
+    <root>/mccore/src/main/resources/assets/<pack>/textures/items/vehicles/*.png
+
+Vehicle JSONs carry the sections the maintenance scripts work on
+(rendering.animatedObjects, connectionGroups, variableModifiers and
+definitions[].extraMaterialLists). Skins are painted from the specular
+COLOR_MAP sources plus configurator layer colors, with a little noise, so they
+exercise the same color paths as real textures. Output is fully determined by
+the seed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from PIL import Image, ImageDraw
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from generate_specular_maps import COLOR_MAP, hex_to_rgb  # noqa: E402
+
+ASSETS_SUBPATH = Path("mccore", "src", "main", "resources", "assets")
+CATEGORIES = ["car", "truck", "van", "bus"]
+OBJECT_NAMES = ["door_l", "door_r", "hood", "trunk", "tailgate", "wheel_fl", "wheel_fr", "steering_wheel"]
+BODYROLL_VARIABLES = ["rlBodyroll", "rrBodyroll", "flBodyroll", "frBodyroll"]
+WOOL_PAIRS = [("7", "8"), ("4", "0"), ("7", "14"), ("15", "14"), ("8", "0"), ("12", "7")]
+LAYER_COLORS = [(66, 66, 66), (130, 130, 130), (81, 81, 81), (127, 51, 0),
+                (255, 255, 255), (255, 0, 220), (178, 0, 255), (255, 0, 110)]
+
+
+def assets_root(root: Path) -> Path:
+    return root / ASSETS_SUBPATH
+
+
+def load_paint_buckets() -> List[str]:
+    with (REPO_ROOT / "paint_replacements.json").open("r", encoding="utf-8") as handle:
+        return list(json.load(handle).get("replacements", {}))
+
+
+def build_vehicle(rng: random.Random, name: str, paint_buckets: List[str]) -> Dict[str, Any]:
+    def coord() -> float:
+        return round(rng.uniform(-3.0, 3.0), 4)
+
+    animated_objects = []
+    for object_name in rng.sample(OBJECT_NAMES, rng.randint(3, len(OBJECT_NAMES))):
+        animations = []
+        for _ in range(rng.randint(1, 3)):
+            animations.append({
+                "animationType": "rotation",
+                "variable": object_name,
+                "centerPoint": [coord(), coord(), coord()],
+                "axis": [0.0, rng.choice([-90.0, 90.0]), 0.0],
+            })
+        animated_objects.append({"objectName": object_name, "animations": animations})
+
+    connections = [
+        {"type": "tow_wheel", "pos": [0.0, round(rng.uniform(0.2, 0.8), 4), round(rng.uniform(-3.0, -2.0), 4)], "distance": 2.0},
+        {"type": "tow_wheel_heavy", "pos": [0.0, 0.6, -3.2], "distance": 2.0},
+    ]
+    for _ in range(rng.randint(1, 3)):
+        connections.append({"type": "tow_bumper", "pos": [0.0, 0.5, round(rng.uniform(-3.5, -2.5), 4)], "distance": 2.0})
+    if rng.random() < 0.2:
+        connections.append({"type": "tow_flatbed", "pos": [0.0, 0.5, -3.0], "distance": 2.0})
+    connection_groups = [
+        {"groupName": "HOOKUP", "isHookup": True, "connections": connections},
+        {"groupName": "TRAILER", "isHitch": True, "connections": [{"type": "trailer", "pos": [0.0, 0.4, -3.1], "distance": 2.0}]},
+    ]
+
+    variable_modifiers = []
+    for variable in BODYROLL_VARIABLES:
+        animations = [{"animationType": "translation", "variable": "acceleration", "axis": [0.0, 0.0, 0.02]}]
+        if rng.random() < 0.3:
+            animations.append({"animationType": "visibility", "variable": "engine_running_1", "clampMin": 1.0, "clampMax": 1.0})
+        variable_modifiers.append({"variable": variable, "animations": animations})
+
+    definitions = []
+    for index in range(rng.randint(2, 6)):
+        wool_a, wool_b = rng.choice(WOOL_PAIRS)
+        definitions.append({
+            "subName": f"_{index}",
+            "name": f"{name} {index}",
+            "extraMaterialLists": [
+                [f"minecraft:wool:{wool_a}:{rng.randint(1, 6)}", f"minecraft:wool:{wool_b}:{rng.randint(1, 6)}"],
+                [rng.choice(paint_buckets), "minecraft:iron_ingot:0:2"],
+            ],
+        })
+
+    return {
+        "definitions": definitions,
+        "general": {"name": name, "description": "Synthetic benchmark vehicle", "health": 100},
+        "rendering": {"textureObjectNames": ["body"], "animatedObjects": animated_objects},
+        "connectionGroups": connection_groups,
+        "variableModifiers": variable_modifiers,
+    }
+
+
+def build_skin(rng: random.Random, size: int, palette: List[tuple]) -> Image.Image:
+    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for _ in range(rng.randint(20, 60)):
+        x0, y0 = rng.randrange(size), rng.randrange(size)
+        x1, y1 = min(size, x0 + rng.randint(1, size // 3)), min(size, y0 + rng.randint(1, size // 3))
+        draw.rectangle([x0, y0, x1, y1], fill=rng.choice(palette) + (255,))
+    # Sprinkle a little off-palette noise, like hand-painted textures have.
+    pixels = img.load()
+    for _ in range(size * size // 200):
+        x, y = rng.randrange(size), rng.randrange(size)
+        r, g, b, a = pixels[x, y]
+        if a:
+            pixels[x, y] = (min(255, r + rng.randint(0, 2)), g, max(0, b - rng.randint(0, 2)), a)
+    return img
+
+
+def generate_tree(root: Path, packs: int = 2, vehicles: int = 50, skins: int = 50, size: int = 128,
+                  duplicate_ratio: float = 0.2, seed: int = 0) -> Dict[str, int]:
+    """Write a synthetic asset tree under root and return how many files of each kind were created."""
+    rng = random.Random(seed)
+    paint_buckets = load_paint_buckets()
+    palette = [hex_to_rgb(k) for k in COLOR_MAP] + LAYER_COLORS
+    counts = {"vehicle_jsons": 0, "skins": 0, "item_pngs": 0}
+
+    for pack_index in range(packs):
+        pack_dir = assets_root(root) / f"synthpack{pack_index}"
+        for vehicle_index in range(vehicles):
+            name = f"synth_{pack_index}_{vehicle_index:04d}"
+            vehicle_dir = pack_dir / "jsondefs" / "vehicles" / rng.choice(CATEGORIES)
+            vehicle_dir.mkdir(parents=True, exist_ok=True)
+            data = build_vehicle(rng, name, paint_buckets)
+            (vehicle_dir / f"{name}.json").write_text(json.dumps(data, indent=4) + "\n", encoding="utf-8")
+            counts["vehicle_jsons"] += 1
+
+        skin_dir = pack_dir / "textures" / "vehicles"
+        items_dir = pack_dir / "textures" / "items" / "vehicles"
+        skin_dir.mkdir(parents=True, exist_ok=True)
+        items_dir.mkdir(parents=True, exist_ok=True)
+        written: List[Path] = []
+        for skin_index in range(skins):
+            skin_path = skin_dir / f"synth_{pack_index}_{skin_index:04d}.png"
+            if written and rng.random() < duplicate_ratio:
+                skin_path.write_bytes(rng.choice(written).read_bytes())
+            else:
+                build_skin(rng, size, palette).save(skin_path)
+            written.append(skin_path)
+            counts["skins"] += 1
+            Image.new("RGBA", (16, 16), rng.choice(palette) + (255,)).save(items_dir / skin_path.name)
+            counts["item_pngs"] += 1
+
+    return counts
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic asset tree for benchmarks.")
+    parser.add_argument("root", help="Directory to create the tree in (the mccore/ parent).")
+    parser.add_argument("--packs", type=int, default=2, help="Number of packs (default: 2).")
+    parser.add_argument("--vehicles", type=int, default=50, help="Vehicle JSONs per pack (default: 50).")
+    parser.add_argument("--skins", type=int, default=50, help="Skin PNGs per pack (default: 50).")
+    parser.add_argument("--size", type=int, default=128, help="Skin width and height in pixels (default: 128).")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.2, help="Share of skins that copy an earlier one (default: 0.2).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    args = parser.parse_args(argv)
+
+    counts = generate_tree(Path(args.root), args.packs, args.vehicles, args.skins, args.size,
+                           args.duplicate_ratio, args.seed)
+    print(f"[INFO] Generated {counts['vehicle_jsons']} vehicle JSONs, {counts['skins']} skins "
+          f"and {counts['item_pngs']} item textures under {args.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
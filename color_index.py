@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Persistent color -> texture index for instant reverse lookups.
+
+Stores, in a SQLite database, which colors every PNG under a root contains and
+how many pixels of each. Updates are incremental (see file_index.py): only
+textures whose size, mtime and content hash changed are rescanned.
+
+Usage:
+    python color_index.py update path/to/assets
+    python color_index.py query path/to/assets "#FF0000" "#B200FF"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import file_index
+from generate_specular_maps import SPECULAR_SUFFIX, hex_to_rgb
+from hex_scanner import scan_file
+
+DB_NAME = ".color_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS colors (
+    color INTEGER NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    pixels INTEGER NOT NULL,
+    PRIMARY KEY (color, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS colors_by_file ON colors(file_id);
+"""
+
+
+def rgb_to_int(rgb: Tuple[int, int, int]) -> int:
+    r, g, b = rgb
+    return (r << 16) | (g << 8) | b
+
+
+def open_index(db_path: Path) -> sqlite3.Connection:
+    return file_index.open_index(db_path, SCHEMA)
+
+
+def iter_textures(root: Path) -> List[Path]:
+    return sorted(p for p in root.rglob("*") if p.is_file()
+                  and p.name.lower().endswith(".png") and not p.name.lower().endswith(SPECULAR_SUFFIX))
+
+
+def store_colors(conn: sqlite3.Connection, file_id: int, counts: Dict[Tuple[int, int, int], int]) -> None:
+    conn.executemany("INSERT INTO colors (color, file_id, pixels) VALUES (?, ?, ?)",
+                     [(rgb_to_int(rgb), file_id, pixels) for rgb, pixels in counts.items()])
+
+
+def update_index(conn: sqlite3.Connection, root: Path, workers: Optional[int] = None) -> Dict[str, int]:
+    """Bring the index in line with the PNGs under root; returns counts of what was done.
+
+    Unreadable textures are recorded with their error and no colors, so they drop out of
+    queries and are not retried until they change.
+    """
+    return file_index.update_index(conn, root, iter_textures(root), ["colors"], scan_file, store_colors, workers)
+
+
+def find_textures(conn: sqlite3.Connection, hex_color: str) -> List[Tuple[str, int]]:
+    """Return (relative path, pixel count) for every indexed texture containing the color."""
+    rows = conn.execute(
+        "SELECT f.path, c.pixels FROM colors c JOIN files f ON f.id = c.file_id "
+        "WHERE c.color = ? ORDER BY c.pixels DESC, f.path",
+        (rgb_to_int(hex_to_rgb(hex_color)),),
+    )
+    return rows.fetchall()
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Maintain and query a color -> texture index.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    update_parser = subparsers.add_parser("update", help="Rescan textures that changed since the last update.")
+    update_parser.add_argument("root", help="Root directory containing the textures.")
+
+    query_parser = subparsers.add_parser("query", help="List the textures containing one or more colors.")
+    query_parser.add_argument("root", help="Root directory the index was built for.")
+    query_parser.add_argument("colors", nargs="+", help="Hex colors such as #FF0000.")
+    query_parser.add_argument("--update", action="store_true", help="Refresh the index before querying.")
+    query_parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    for sub in (update_parser, query_parser):
+        sub.add_argument("--db", help=f"Index database path (default: <root>/{DB_NAME}).")
+        sub.add_argument("--workers", type=int, default=None, help="Worker processes for rescans (default: CPU count).")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root).resolve()
+    if not root.is_dir():
+        print(f"[ERROR] Not a directory: {root}")
+        return 2
+    conn = open_index(Path(args.db) if args.db else root / DB_NAME)
+    try:
+        if args.command == "update" or args.update:
+            stats = update_index(conn, root, args.workers)
+            if args.command == "update":
+                print("[SUMMARY] " + "  ".join(f"{name}: {count}" for name, count in stats.items()))
+                return 0
+
+        results = {hex_color.upper(): find_textures(conn, hex_color) for hex_color in args.colors}
+        if args.json:
+            print(json.dumps({color: [{"path": path, "pixels": pixels} for path, pixels in rows]
+                              for color, rows in results.items()}, indent=4))
+        else:
+            for color, rows in results.items():
+                print(f"{color}: {len(rows)} textures")
+                for path, pixels in rows:
+                    print(f"  {pixels:>8}  {path}")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
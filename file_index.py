@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Shared scaffolding for the incremental SQLite indexes (color_index.py, vehicle_index.py).
+
+Each index keeps a files table of relative path, size, mtime, content hash and
+the error from the last failed scan, plus its own tables of per-file rows that
+reference files(id). update_index brings that table in line with a list of
+files under a root:
+
+ - files whose size and mtime are unchanged are skipped;
+ - files that were only touched are recognised by their content hash and get
+   their new mtime recorded;
+ - everything else is scanned again (in a process pool when more than one file
+   changed) and its rows are replaced;
+ - files that fail to scan are recorded with their error and no rows, so they
+   drop out of queries and are not retried until they change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+FILES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    error TEXT
+);
+"""
+
+# scan(path) -> (path, payload, error); it runs in worker processes, so it must be a module-level function.
+ScanFn = Callable[[str], Tuple[str, Any, Optional[str]]]
+# store(conn, file_id, payload) inserts the rows for one successfully scanned file.
+StoreFn = Callable[[sqlite3.Connection, int, Any], None]
+
+
+def open_index(db_path: Path, schema: str) -> sqlite3.Connection:
+    """Open (creating if needed) an index with the files table plus the index's own schema."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(FILES_SCHEMA + schema)
+    return conn
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def update_index(conn: sqlite3.Connection, root: Path, paths: Iterable[Path], row_tables: List[str],
+                 scan: ScanFn, store: StoreFn, workers: Optional[int] = None, chunksize: int = 8,
+                 failure: str = "Could not read") -> Dict[str, int]:
+    """Bring the files table and row_tables in line with paths (all under root); returns counts of what was done.
+
+    failure starts the warning printed for a file that could not be scanned.
+    """
+    stats = {"unchanged": 0, "touched": 0, "rescanned": 0, "removed": 0, "failed": 0}
+    known = {row[0]: row[1:] for row in conn.execute("SELECT path, id, size, mtime_ns, sha1 FROM files")}
+    seen = set()
+    to_scan: List[Tuple[str, Path, os.stat_result, str]] = []
+
+    for path in paths:
+        key = path.relative_to(root).as_posix()
+        seen.add(key)
+        st = path.stat()
+        entry = known.get(key)
+        if entry is not None and entry[1] == st.st_size and entry[2] == st.st_mtime_ns:
+            stats["unchanged"] += 1
+            continue
+        sha1 = hash_file(path)
+        if entry is not None and entry[3] == sha1:
+            conn.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?", (st.st_size, st.st_mtime_ns, entry[0]))
+            stats["touched"] += 1
+            continue
+        to_scan.append((key, path, st, sha1))
+
+    for key in set(known) - seen:
+        conn.execute("DELETE FROM files WHERE id = ?", (known[key][0],))
+        stats["removed"] += 1
+
+    if to_scan:
+        scan_paths = [str(path) for _, path, _, _ in to_scan]
+        if workers == 1 or len(to_scan) == 1:
+            scans = map(scan, scan_paths)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            scans = executor.map(scan, scan_paths, chunksize=chunksize)
+        try:
+            for (key, _, st, sha1), (scanned_path, payload, error) in zip(to_scan, scans):
+                if error is not None:
+                    print(f"[WARN] {failure} {scanned_path}: {error}")
+                    stats["failed"] += 1
+                else:
+                    stats["rescanned"] += 1
+                conn.execute(
+                    "INSERT INTO files (path, size, mtime_ns, sha1, error) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, "
+                    "sha1 = excluded.sha1, error = excluded.error",
+                    (key, st.st_size, st.st_mtime_ns, sha1, error),
+                )
+                file_id = conn.execute("SELECT id FROM files WHERE path = ?", (key,)).fetchone()[0]
+                for table in row_tables:
+                    conn.execute(f"DELETE FROM {table} WHERE file_id = ?", (file_id,))
+                if error is None:
+                    store(conn, file_id, payload)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    conn.commit()
+    return stats
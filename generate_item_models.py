@@ -1,7 +1,8 @@
 import argparse
-import json
 from pathlib import Path
 
+from json_io import WRITE_COUNTS, write_json_if_changed
+
 
 def collect_item_pngs(assets_dir: Path) -> list[Path]:
     png_files: list[Path] = []
@@ -52,8 +53,8 @@ def generate_models(base_path: Path) -> tuple[int, int]:
         model_path = output_dir / model_name
 
         model_data = build_model_json(pack_id, texture_path)
-        model_path.write_text(json.dumps(model_data, separators=(",", ":")), encoding="utf-8")
-        written_count += 1
+        if write_json_if_changed(model_path, model_data, indent=None, separators=(",", ":")):
+            written_count += 1
 
     return len(png_files), written_count
 
@@ -71,7 +72,8 @@ def main() -> None:
     args = parser.parse_args()
 
     scanned, written = generate_models(args.base_path.resolve())
-    print(f"Scanned {scanned} PNG texture(s), wrote {written} model JSON file(s).")
+    print(f"Scanned {scanned} PNG texture(s), wrote {written} model JSON file(s), "
+          f"{WRITE_COUNTS['unchanged']} already up to date.")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,16 @@
 import os
 import pathlib
 import argparse
+import hashlib
+import io
+import json
+import shutil
 import time
+import numpy as np
 from PIL import Image
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from file_index import hash_file
 
 # === Configuration ===
 SPECULAR_SUFFIX = "_s.png"
@@ -49,14 +56,23 @@ COLOR_MAP = {
 }
 DEFAULT_COLOR = "#666666"
 NOISE_TOLERANCE = 3
+DEFAULT_NOISE_TOLERANCE = 0  # --noise-tolerance default, i.e. what command-line runs actually use
+PALETTE_THRESHOLD = 256  # Images with at most this many colors are mapped per color instead of per pixel; 0 disables
 OVERRIDE_EXISTING = False
 USE_MULTITHREADING = False  # Set to True to enable multithreading
+WORKERS = 0  # Number of worker processes; 0 keeps processing in this process
+INCREMENTAL = False  # Set to True to only rebuild maps whose inputs changed
 BLACKLIST = {"vignette.png"}  # Add filenames to blacklist
+MANIFEST_NAME = ".specular_manifest.json"  # Written under BASE_PATH by incremental runs
+MANIFEST_VERSION = 1
 
 # === Paths ===
 BASE_PATH = None
 EXCLUDE_PATH = None
 
+# === Compiled color table (built once per run in main) ===
+COLOR_ENGINE = None
+
 # === Helper Functions ===
 def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip("#")
@@ -79,6 +95,7 @@ def color_within_tolerance(pixel_rgb, target_rgb, tolerance):
     return all(abs(p - t) <= tolerance for p, t in zip(pixel_rgb, target_rgb))
 
 def map_pixel_color(pixel_rgb):
+    """Reference darkest-match rule, scanning every COLOR_MAP entry. ColorEngine gives the same answers faster."""
     matched_colors = []
     for k_hex, v_hex in COLOR_MAP.items():
         target_rgb = hex_to_rgb(k_hex)
@@ -89,91 +106,551 @@ def map_pixel_color(pixel_rgb):
         return min(matched_colors, key=lambda rgb: sum(rgb))
     return hex_to_rgb(DEFAULT_COLOR)
 
+# === Color Engine ===
+class ColorIndex:
+    """Tolerance-bucketed grid over the source colors of a color map.
+
+    Cells are tolerance + 1 wide on each channel, so every source color within
+    tolerance of a pixel sits in the pixel's cell or one of its 26 neighbours.
+    A lookup checks at most 27 cells no matter how large the map grows.
+    """
+
+    def __init__(self, ranked_entries, tolerance):
+        self.tolerance = tolerance
+        self.cell_size = tolerance + 1
+        self.cells = {}
+        for rank, (target_rgb, palette_index) in enumerate(ranked_entries):
+            self.cells.setdefault(self.cell_of(target_rgb), []).append((rank, target_rgb, palette_index))
+
+    def cell_of(self, rgb):
+        return tuple(c // self.cell_size for c in rgb)
+
+    def best_match(self, pixel_rgb):
+        """Palette index of the strongest entry within tolerance, or None if nothing matches."""
+        cell_r, cell_g, cell_b = self.cell_of(pixel_rgb)
+        best_rank, best_index = None, None
+        for r in (cell_r - 1, cell_r, cell_r + 1):
+            for g in (cell_g - 1, cell_g, cell_g + 1):
+                for b in (cell_b - 1, cell_b, cell_b + 1):
+                    for rank, target_rgb, palette_index in self.cells.get((r, g, b), ()):
+                        if best_rank is not None and rank >= best_rank:
+                            break  # cells are filled in rank order
+                        if color_within_tolerance(pixel_rgb, target_rgb, self.tolerance):
+                            best_rank, best_index = rank, palette_index
+                            break
+        return best_index
+
+class ColorEngine:
+    """COLOR_MAP, DEFAULT_COLOR and NOISE_TOLERANCE compiled for whole-image mapping.
+
+    Images with at most `palette_threshold` distinct colors are mapped per color:
+    each unique color is classified once and the image is remapped in a single
+    NumPy pass. Busier images go through a (256, 256, 256) table that classifies
+    every possible RGB value into a small palette of output colors; the table is
+    only built the first time such an image shows up. Either way the result is
+    identical to map_pixel_color: the darkest matching output wins, ties going
+    to the entry listed first in the color map.
+    """
+
+    def __init__(self, color_map, default_color, tolerance, palette_threshold=0):
+        self.tolerance = tolerance
+        self.palette_threshold = palette_threshold
+        outputs = [hex_to_rgb(default_color)]
+        entries = []
+        for order, (k_hex, v_hex) in enumerate(color_map.items()):
+            target_rgb = hex_to_rgb(k_hex)
+            mapped_rgb = hex_to_rgb(v_hex)
+            if mapped_rgb not in outputs:
+                outputs.append(mapped_rgb)
+            entries.append((sum(mapped_rgb), order, target_rgb, outputs.index(mapped_rgb)))
+        self.palette = np.array(outputs, dtype=np.uint8)
+        # Strongest match first: the first entry within tolerance wins.
+        self.ranked_entries = [(target_rgb, palette_index) for _, _, target_rgb, palette_index in sorted(entries)]
+        self.index = ColorIndex(self.ranked_entries, tolerance)
+        self._table = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            index_type = np.uint8 if len(self.palette) <= 256 else np.uint16
+            table = np.zeros((256, 256, 256), dtype=index_type)
+            # Paint the weakest matches first so the winning entry is written last.
+            for target_rgb, palette_index in reversed(self.ranked_entries):
+                r, g, b = (slice(max(c - self.tolerance, 0), min(c + self.tolerance, 255) + 1) for c in target_rgb)
+                table[r, g, b] = palette_index
+            self._table = table
+        return self._table
+
+    def classify(self, pixel_rgb):
+        """Palette index for a single RGB value, looked up in the color index."""
+        palette_index = self.index.best_match(pixel_rgb)
+        return 0 if palette_index is None else palette_index
+
+    def map_rgb(self, pixel_rgb):
+        return tuple(int(c) for c in self.palette[self.classify(pixel_rgb)])
+
+    def map_pixels(self, rgba):
+        """Map an (..., 4) uint8 RGBA array, leaving fully transparent pixels untouched."""
+        mapped = rgba.copy()
+        opaque = rgba[..., 3] != 0
+        visible = rgba[opaque]
+        mapped[opaque, :3] = self.palette[self.table[visible[:, 0], visible[:, 1], visible[:, 2]]]
+        return mapped
+
+    def map_unique_colors(self, rgba, colors):
+        """Map an RGBA array whose distinct colors are known (as returned by Image.getcolors)."""
+        mapped = rgba.copy()
+        keys = sorted({(r << 16) | (g << 8) | b for _, (r, g, b, a) in colors if a != 0})
+        if not keys:
+            return mapped
+        color_keys = np.array(keys, dtype=np.uint32)
+        color_indices = np.array([self.classify(((k >> 16) & 0xFF, (k >> 8) & 0xFF, k & 0xFF)) for k in keys])
+        opaque = rgba[..., 3] != 0
+        visible = rgba[opaque].astype(np.uint32)
+        pixel_keys = (visible[:, 0] << 16) | (visible[:, 1] << 8) | visible[:, 2]
+        mapped[opaque, :3] = self.palette[color_indices[np.searchsorted(color_keys, pixel_keys)]]
+        return mapped
+
+    def apply(self, img):
+        """Map an RGBA image in place."""
+        rgba = np.asarray(img)
+        colors = img.getcolors(self.palette_threshold) if self.palette_threshold > 0 else None
+        if colors is None:
+            mapped = self.map_pixels(rgba)
+        else:
+            mapped = self.map_unique_colors(rgba, colors)
+        img.frombytes(mapped.tobytes())
+        return img
+
+def build_color_engine():
+    return ColorEngine(COLOR_MAP, DEFAULT_COLOR, NOISE_TOLERANCE, PALETTE_THRESHOLD)
+
+def default_worker_count():
+    return os.cpu_count() or 1
+
+def specular_path_for(image_path):
+    return os.path.splitext(image_path)[0] + SPECULAR_SUFFIX
+
+def hash_bytes(data):
+    return hashlib.sha1(data).hexdigest()
+
+def file_record(path, sha1):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": sha1}
+
 def process_image(image_path):
-    specular_name = os.path.splitext(image_path)[0] + SPECULAR_SUFFIX
-    if not OVERRIDE_EXISTING and os.path.exists(specular_name):
-        return
+    """Generate the specular map for one image.
+
+    Returns (message, record): the line to report, and the source/output
+    fingerprints for the manifest (None if the image failed).
+    """
+    specular_name = specular_path_for(image_path)
     try:
-        with Image.open(image_path).convert("RGBA") as img:
-            pixels = img.load()
-            for y in range(img.height):
-                for x in range(img.width):
-                    r, g, b, a = pixels[x, y]
-                    if a == 0:
-                        continue
-                    mapped_rgb = map_pixel_color((r, g, b))
-                    pixels[x, y] = (*mapped_rgb, a)
-            img.save(specular_name)
-            print(f"Generated specular map for: {os.path.relpath(image_path, BASE_PATH)}")
+        source_stat = os.stat(image_path)
+        with open(image_path, "rb") as f:
+            source_bytes = f.read()
+        with Image.open(io.BytesIO(source_bytes)).convert("RGBA") as img:
+            COLOR_ENGINE.apply(img)
+            buffer = io.BytesIO()
+            img.save(buffer, format="PNG")
+        output_bytes = buffer.getvalue()
+        # Write beside the target and swap it in, so maps hardlinked to this
+        # one by deduplication are not rewritten through the shared inode.
+        temp_name = specular_name + ".tmp"
+        with open(temp_name, "wb") as f:
+            f.write(output_bytes)
+        os.replace(temp_name, specular_name)
+        record = {
+            "source": {"size": source_stat.st_size, "mtime_ns": source_stat.st_mtime_ns, "sha1": hash_bytes(source_bytes)},
+            "output": file_record(specular_name, hash_bytes(output_bytes)),
+        }
+        return f"Generated specular map for: {os.path.relpath(image_path, BASE_PATH)}", record
     except Exception as e:
-        print(f"Error processing {image_path}: {e}")
+        return f"Error processing {image_path}: {e}", None
 
-def cleanup_orphans(valid_sources):
-    for dirpath, _, filenames in os.walk(BASE_PATH):
-        for file in filenames:
-            if file.endswith(SPECULAR_SUFFIX):
-                specular_path = os.path.join(dirpath, file)
-                source_path = specular_path[:-6] + ".png"
-                if os.path.normpath(source_path) not in valid_sources:
-                    os.remove(specular_path)
-                    print(f"Removed orphaned specular map: {os.path.relpath(specular_path, BASE_PATH)}")
+def init_worker(base_path, color_engine):
+    """Process-pool initializer: receives the compiled color table once per worker."""
+    global BASE_PATH, COLOR_ENGINE
+    BASE_PATH = base_path
+    COLOR_ENGINE = color_engine
+
+def group_identical_images(image_paths):
+    """Map each image to the first image with byte-identical content."""
+    first_by_hash = {}
+    duplicates = {}
+    for img_path in image_paths:
+        try:
+            content_hash = hash_file(img_path)
+        except OSError:
+            continue  # process_image reports the read error
+        if content_hash in first_by_hash:
+            duplicates.setdefault(first_by_hash[content_hash], []).append(img_path)
+        else:
+            first_by_hash[content_hash] = img_path
+    return duplicates
+
+def link_or_copy(source_path, target_path):
+    temp_path = target_path + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    try:
+        os.link(source_path, temp_path)
+    except OSError:
+        shutil.copyfile(source_path, temp_path)
+    os.replace(temp_path, target_path)
+
+def reuse_specular_map(image_path, source_image, source_record):
+    """Give a duplicate image the specular map already generated for an identical source."""
+    if source_record is None:
+        return f"Error processing {image_path}: identical to failed image {source_image}", None
+    try:
+        specular_name = specular_path_for(image_path)
+        link_or_copy(specular_path_for(source_image), specular_name)
+        record = {
+            "source": file_record(image_path, source_record["source"]["sha1"]),
+            "output": file_record(specular_name, source_record["output"]["sha1"]),
+        }
+        return f"Generated specular map for: {os.path.relpath(image_path, BASE_PATH)}", record
+    except Exception as e:
+        return f"Error processing {image_path}: {e}", None
+
+def largest_first(image_paths):
+    def file_size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+    return sorted(image_paths, key=file_size, reverse=True)
+
+# === Incremental Manifest ===
+def settings_hash():
+    """Hash of everything besides the source pixels that affects the output."""
+    payload = json.dumps([list(COLOR_MAP.items()), DEFAULT_COLOR, NOISE_TOLERANCE])
+    return hash_bytes(payload.encode("utf-8"))
+
+def manifest_key(image_path):
+    return pathlib.Path(os.path.relpath(image_path, BASE_PATH)).as_posix()
+
+def load_manifest():
+    try:
+        with open(os.path.join(BASE_PATH, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("entries", {})
+
+def save_manifest(entries):
+    manifest_path = os.path.join(BASE_PATH, MANIFEST_NAME)
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "entries": entries}, f, indent=1, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+def file_matches(record, path):
+    """Cheap stat check against a manifest record, falling back to the content hash when only the mtime moved."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size != record.get("size"):
+        return False
+    if st.st_mtime_ns == record.get("mtime_ns"):
+        return True
+    if hash_file(path) != record.get("sha1"):
+        return False
+    record["mtime_ns"] = st.st_mtime_ns
+    return True
+
+def is_up_to_date(entry, image_path, current_settings):
+    if not entry or entry.get("settings") != current_settings:
+        return False
+    return (file_matches(entry.get("source", {}), image_path)
+            and file_matches(entry.get("output", {}), specular_path_for(image_path)))
+
+def select_images(images, manifest):
+    """Pick the images whose specular map has to be (re)generated."""
+    if OVERRIDE_EXISTING:
+        return list(images)
+    if manifest is None:
+        return [img_path for img_path in images if not os.path.exists(specular_path_for(img_path))]
+    current_settings = settings_hash()
+    return [img_path for img_path in images
+            if not is_up_to_date(manifest.get(manifest_key(img_path)), img_path, current_settings)]
+
+def update_manifest(manifest, found_sources, records):
+    current_settings = settings_hash()
+    for img_path, record in records.items():
+        manifest[manifest_key(img_path)] = dict(record, settings=current_settings)
+    valid_keys = {manifest_key(source) for source in found_sources}
+    for key in [key for key in manifest if key not in valid_keys]:
+        del manifest[key]
+
+def find_orphans(specular_maps, valid_sources):
+    return [specular_path for specular_path in specular_maps
+            if os.path.normpath(specular_path[:-len(SPECULAR_SUFFIX)] + ".png") not in valid_sources]
+
+def cleanup_orphans(specular_maps, valid_sources):
+    for specular_path in find_orphans(specular_maps, valid_sources):
+        os.remove(specular_path)
+        print(f"Removed orphaned specular map: {os.path.relpath(specular_path, BASE_PATH)}")
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Generate specular maps for images.")
     parser.add_argument("--base-path", type=str, required=True, help="Base path for assets.")
-    parser.add_argument("--noise-tolerance", type=int, default=0, help="Tolerance for noise in color matching (default: 0).")
+    parser.add_argument("--noise-tolerance", type=int, default=DEFAULT_NOISE_TOLERANCE,
+                        help=f"Tolerance for noise in color matching (default: {DEFAULT_NOISE_TOLERANCE}).")
+    parser.add_argument("--palette-threshold", type=int, default=PALETTE_THRESHOLD,
+                        help=f"Map images with at most N distinct colors per color instead of per pixel; 0 disables (default: {PALETTE_THRESHOLD}).")
     parser.add_argument("--override-existing", action="store_true", help="Override existing specular maps.")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"Only rebuild maps whose source or color settings changed, tracked in {MANIFEST_NAME}.")
     parser.add_argument("--use-multithreading", action="store_true", help="Enable multithreading for faster processing.")
+    parser.add_argument("--workers", type=int, nargs="?", const=default_worker_count(), default=0,
+                        help="Process images in a pool of N worker processes (N defaults to the number of CPU cores).")
+    parser.add_argument("--watch", action="store_true",
+                        help="After the initial build, keep running and regenerate maps as textures are saved or deleted.")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between tree polls in watch mode (default: 1.0).")
+    parser.add_argument("--debounce", type=float, default=0.5,
+                        help="Seconds without further changes before a watch-mode rebuild (default: 0.5).")
     return parser.parse_args()
 
 # === Main ===
-def collect_images_to_process():
-    found_sources = set()
-    images_to_process = []
+def list_directory(dirpath):
+    """List one directory: (subdirs to descend into, source images, specular maps)."""
+    subdirs = []
+    source_images = []
+    specular_maps = []
+    excluded = os.path.normcase(EXCLUDE_PATH)
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.is_symlink() and os.path.normcase(entry.path) != excluded:
+                    subdirs.append(entry.path)
+                continue
+            file = entry.name
+            if file.endswith(SPECULAR_SUFFIX):
+                specular_maps.append(entry.path)
+            if file.lower().endswith(".png") and not file.lower().endswith(SPECULAR_SUFFIX):
+                if is_valid_image_path(entry.path):
+                    source_images.append(entry.path)
+    return subdirs, source_images, specular_maps
+
+def scan_asset_tree():
+    """Walk BASE_PATH once, pruning EXCLUDE_PATH.
+
+    Returns (found_sources, source_images, specular_maps), visited in the same
+    top-down order as os.walk so reporting order is unchanged.
+    """
+    source_images = []
+    specular_maps = []
 
-    for dirpath, _, filenames in os.walk(BASE_PATH):
-        if os.path.commonpath([EXCLUDE_PATH, dirpath]) == EXCLUDE_PATH:
+    pending = [BASE_PATH]
+    while pending:
+        try:
+            subdirs, dir_sources, dir_speculars = list_directory(pending.pop())
+        except OSError:
             continue
+        source_images.extend(dir_sources)
+        specular_maps.extend(dir_speculars)
+        pending.extend(reversed(subdirs))
 
-        for file in filenames:
-            if file.lower().endswith(".png") and not file.lower().endswith(SPECULAR_SUFFIX):
-                full_path = os.path.join(dirpath, file)
-                if not is_valid_image_path(full_path):
-                    continue
-                found_sources.add(os.path.normpath(full_path))
-                images_to_process.append(full_path)
+    found_sources = {os.path.normpath(img_path) for img_path in source_images}
+    return found_sources, source_images, specular_maps
 
-    return found_sources, images_to_process
+def process_images(images_to_process, parallel=True):
+    """Generate specular maps and return the manifest records of the ones that succeeded.
 
-def process_images(images_to_process):
+    Byte-identical sources are decoded and mapped once; their copies get the
+    resulting map hardlinked (or copied) and are reported right after it.
+    """
     start_time = time.time()
-    if USE_MULTITHREADING:
+    records = {}
+    duplicates = group_identical_images(images_to_process)
+    duplicate_paths = {dup for dups in duplicates.values() for dup in dups}
+    unique_images = [img_path for img_path in images_to_process if img_path not in duplicate_paths]
+
+    def report(img_path, result):
+        message, record = result
+        print(message)
+        if record is not None:
+            records[img_path] = record
+        for duplicate in duplicates.get(img_path, []):
+            dup_message, dup_record = reuse_specular_map(duplicate, img_path, record)
+            print(dup_message)
+            if dup_record is not None:
+                records[duplicate] = dup_record
+
+    def result_of(img_path, future):
+        try:
+            return future.result()
+        except Exception as e:
+            return f"Error processing {img_path}: {e}", None
+
+    if parallel and WORKERS > 0:
+        with ProcessPoolExecutor(max_workers=WORKERS, initializer=init_worker,
+                                 initargs=(BASE_PATH, COLOR_ENGINE)) as executor:
+            # Big images go first so no worker is left chewing on one at the end,
+            # but results are reported in the same order as the serial path.
+            futures = {img_path: executor.submit(process_image, img_path) for img_path in largest_first(unique_images)}
+            for img_path in unique_images:
+                report(img_path, result_of(img_path, futures[img_path]))
+    elif parallel and USE_MULTITHREADING:
         with ThreadPoolExecutor() as executor:
-            future_to_image = {executor.submit(process_image, img_path): img_path for img_path in images_to_process}
+            future_to_image = {executor.submit(process_image, img_path): img_path for img_path in unique_images}
             for future in as_completed(future_to_image):
                 img_path = future_to_image[future]
-                try:
-                    future.result()
-                except Exception as e:
-                    print(f"Error processing {img_path}: {e}")
+                report(img_path, result_of(img_path, future))
     else:
-        for img_path in images_to_process:
-            process_image(img_path)
+        for img_path in unique_images:
+            report(img_path, process_image(img_path))
+    if duplicate_paths:
+        print(f"Deduplicated {len(duplicate_paths)} of {len(images_to_process)} images: "
+              f"{len(unique_images)} unique sources decoded and encoded.")
     end_time = time.time()
     print(f"Processing completed in {end_time - start_time:.2f} seconds.")
+    return records
+
+# === Watch Mode ===
+class TreeWatcher:
+    """Polls the asset tree for saved, added and deleted source textures.
+
+    Directory mtimes are cached so only directories whose listing changed are
+    rescanned; known sources are re-stat'ed each poll to catch in-place saves.
+    """
+
+    def __init__(self):
+        self.dir_mtimes = {}
+        self.sources = {}
+        self.track_directory(BASE_PATH)
+
+    @staticmethod
+    def fingerprint(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def track_directory(self, dirpath):
+        """Index a directory and everything below it; returns the sources found."""
+        found = []
+        pending = [dirpath]
+        while pending:
+            current = pending.pop()
+            try:
+                mtime = os.stat(current).st_mtime_ns
+                subdirs, dir_sources, _ = list_directory(current)
+            except OSError:
+                continue
+            self.dir_mtimes[current] = mtime
+            for img_path in dir_sources:
+                self.sources[img_path] = self.fingerprint(img_path)
+            found.extend(dir_sources)
+            pending.extend(reversed(subdirs))
+        return found
+
+    def forget_directory(self, dirpath):
+        prefix = dirpath + os.sep
+        removed = [img_path for img_path in self.sources if img_path.startswith(prefix)]
+        for img_path in removed:
+            del self.sources[img_path]
+        for path in [path for path in self.dir_mtimes if path == dirpath or path.startswith(prefix)]:
+            del self.dir_mtimes[path]
+        return removed
+
+    def poll(self):
+        """Return (changed sources, removed sources) since the previous poll."""
+        changed, removed = set(), set()
+        for dirpath, cached_mtime in list(self.dir_mtimes.items()):
+            if dirpath not in self.dir_mtimes:
+                continue  # dropped along with a removed parent
+            try:
+                mtime = os.stat(dirpath).st_mtime_ns
+                if mtime == cached_mtime:
+                    continue
+                subdirs, dir_sources, _ = list_directory(dirpath)
+            except OSError:
+                removed.update(self.forget_directory(dirpath))
+                continue
+            self.dir_mtimes[dirpath] = mtime
+            listed = set(dir_sources)
+            for img_path in [p for p in self.sources if os.path.dirname(p) == dirpath and p not in listed]:
+                del self.sources[img_path]
+                removed.add(img_path)
+            for img_path in dir_sources:
+                if img_path not in self.sources:
+                    self.sources[img_path] = self.fingerprint(img_path)
+                    changed.add(img_path)
+            for subdir in subdirs:
+                if subdir not in self.dir_mtimes:
+                    changed.update(self.track_directory(subdir))
+        for img_path, cached in list(self.sources.items()):
+            if img_path in changed:
+                continue
+            current = self.fingerprint(img_path)
+            if current is None:
+                del self.sources[img_path]
+                removed.add(img_path)
+            elif current != cached:
+                self.sources[img_path] = current
+                changed.add(img_path)
+        return changed - removed, removed
+
+def watch_for_changes(manifest, poll_interval, debounce):
+    """Stay resident and regenerate specular maps as sources are saved."""
+    watcher = TreeWatcher()
+    pending_changed, pending_removed = set(), set()
+    last_change = None
+    print(f"Watching {len(watcher.sources)} textures under {BASE_PATH} (Ctrl+C to stop).")
+    try:
+        while True:
+            time.sleep(poll_interval)
+            changed, removed = watcher.poll()
+            if changed or removed:
+                pending_changed = (pending_changed | changed) - removed
+                pending_removed = (pending_removed | removed) - changed
+                last_change = time.time()
+            if last_change is None or time.time() - last_change < debounce:
+                continue
+
+            found_sources = {os.path.normpath(img_path) for img_path in watcher.sources}
+            for img_path in sorted(pending_removed):
+                specular_path = specular_path_for(img_path)
+                if os.path.exists(specular_path):
+                    cleanup_orphans([specular_path], found_sources)
+            records = process_images(sorted(pending_changed), parallel=False) if pending_changed else {}
+            if manifest is not None:
+                update_manifest(manifest, found_sources, records)
+                save_manifest(manifest)
+            pending_changed, pending_removed = set(), set()
+            last_change = None
+    except KeyboardInterrupt:
+        print("Stopped watching.")
 
 def main():
     args = parse_arguments()
-    global BASE_PATH, EXCLUDE_PATH, NOISE_TOLERANCE, OVERRIDE_EXISTING, USE_MULTITHREADING
+    global BASE_PATH, EXCLUDE_PATH, NOISE_TOLERANCE, PALETTE_THRESHOLD, OVERRIDE_EXISTING, INCREMENTAL, USE_MULTITHREADING, WORKERS, COLOR_ENGINE
     BASE_PATH = os.path.abspath(args.base_path)
     EXCLUDE_PATH = os.path.join(BASE_PATH, "mccore", "build")
     NOISE_TOLERANCE = args.noise_tolerance
+    PALETTE_THRESHOLD = args.palette_threshold
     OVERRIDE_EXISTING = args.override_existing
+    INCREMENTAL = args.incremental
     USE_MULTITHREADING = args.use_multithreading
+    WORKERS = args.workers
+    COLOR_ENGINE = build_color_engine()
 
-    found_sources, images_to_process = collect_images_to_process()
-    process_images(images_to_process)
-    cleanup_orphans(found_sources)
+    found_sources, source_images, specular_maps = scan_asset_tree()
+    manifest = load_manifest() if INCREMENTAL else None
+    records = process_images(select_images(source_images, manifest))
+    if manifest is not None:
+        update_manifest(manifest, found_sources, records)
+        save_manifest(manifest)
+    cleanup_orphans(specular_maps, found_sources)
+    if args.watch:
+        watch_for_changes(manifest, args.poll_interval, args.debounce)
 
 if __name__ == "__main__":
     main()
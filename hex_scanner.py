@@ -1,14 +1,111 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
 
-def extract_hex_colors(image_path):
+from generate_specular_maps import (COLOR_MAP, DEFAULT_COLOR, DEFAULT_NOISE_TOLERANCE, SPECULAR_SUFFIX, ColorEngine,
+                                    is_valid_image_path, rgb_to_hex)
+
+def count_colors(image_path):
+    """Return {(r, g, b): pixel_count} for the non-transparent pixels of an image."""
     with Image.open(image_path).convert("RGBA") as img:
-        pixels = img.getdata()
-        unique_colors = {f"#{r:02X}{g:02X}{b:02X}" for r, g, b, a in pixels if a != 0}
-        return sorted(unique_colors)
+        counts = {}
+        for count, (r, g, b, a) in img.getcolors(img.width * img.height):
+            if a != 0:
+                counts[(r, g, b)] = counts.get((r, g, b), 0) + count
+        return counts
+
+def extract_hex_colors(image_path):
+    return sorted(rgb_to_hex(rgb) for rgb in count_colors(image_path))
+
+def scan_file(image_path):
+    try:
+        return image_path, count_colors(image_path), None
+    except Exception as e:
+        return image_path, None, str(e)
+
+def census_images(root):
+    """The PNGs under root that generate_specular_maps maps: mccore/build is pruned and
+    specular maps, item textures and BLACKLIST files are left out."""
+    excluded = os.path.normcase(os.path.join(root, "mccore", "build"))
+    image_paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if os.path.normcase(os.path.join(dirpath, d)) != excluded]
+        for file in filenames:
+            path = os.path.join(dirpath, file)
+            if file.lower().endswith(".png") and not file.lower().endswith(SPECULAR_SUFFIX) and is_valid_image_path(path):
+                image_paths.append(path)
+    return sorted(image_paths)
+
+def palette_census(root, workers=None, tolerance=DEFAULT_NOISE_TOLERANCE):
+    """Count every color across the PNGs generate_specular_maps would map under root.
+
+    Returns one row per color with its total pixel count, the number of files
+    it appears in, and whether COLOR_MAP covers it or it falls to DEFAULT_COLOR.
+    """
+    image_paths = census_images(os.path.abspath(root))
+    pixels, files = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for image_path, counts, error in executor.map(scan_file, image_paths, chunksize=16):
+            if error is not None:
+                print(f"[WARN] Could not read {image_path}: {error}", file=sys.stderr)
+                continue
+            for rgb, count in counts.items():
+                pixels[rgb] = pixels.get(rgb, 0) + count
+                files[rgb] = files.get(rgb, 0) + 1
+
+    engine = ColorEngine(COLOR_MAP, DEFAULT_COLOR, tolerance)
+    rows = []
+    for rgb in sorted(pixels, key=lambda rgb: (-pixels[rgb], rgb)):
+        rows.append({
+            "color": rgb_to_hex(rgb),
+            "pixels": pixels[rgb],
+            "files": files[rgb],
+            "covered": engine.index.best_match(rgb) is not None,
+            "specular": rgb_to_hex(engine.map_rgb(rgb)),
+        })
+    return len(image_paths), rows
+
+def write_census(rows, output_format, handle):
+    if output_format == "csv":
+        writer = csv.DictWriter(handle, fieldnames=["color", "pixels", "files", "covered", "specular"], lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump(rows, handle, indent=4)
+        handle.write("\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="List the colors of a PNG, or take a palette census of a whole tree.")
+    parser.add_argument("--census", metavar="ROOT", help="Scan every PNG under ROOT instead of prompting for one image.")
+    parser.add_argument("--format", choices=["json", "csv"], default="json", help="Census output format (default: json).")
+    parser.add_argument("--output", help="Write the census to this file instead of stdout.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for the census (default: CPU count).")
+    parser.add_argument("--noise-tolerance", type=int, default=DEFAULT_NOISE_TOLERANCE,
+                        help="Tolerance used to decide COLOR_MAP coverage; match the generate_specular_maps.py "
+                             f"--noise-tolerance of the run being checked (default: {DEFAULT_NOISE_TOLERANCE}).")
+    args = parser.parse_args()
+
+    if not args.census:
+        path = input("Enter image path: ").strip()
+        hex_colors = extract_hex_colors(path)
+        print("Hex colors found:")
+        for hex_color in hex_colors:
+            print(hex_color)
+        return
+
+    scanned, rows = palette_census(args.census, args.workers, args.noise_tolerance)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as handle:
+            write_census(rows, args.format, handle)
+        uncovered = sum(1 for row in rows if not row["covered"])
+        print(f"[SUMMARY] Scanned {scanned} images: {len(rows)} colors, {uncovered} not covered by COLOR_MAP. "
+              f"Written to {os.path.abspath(args.output)}")
+    else:
+        write_census(rows, args.format, sys.stdout)
 
 if __name__ == "__main__":
-    path = input("Enter image path: ").strip()
-    hex_colors = extract_hex_colors(path)
-    print("Hex colors found:")
-    for hex_color in hex_colors:
-        print(hex_color)
+    main()
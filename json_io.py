@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Shared JSON loading and writing for the pack scripts.
+
+Asset JSONs often carry // line comments and /* */ block comments. The
+stripper here is string-aware (comment markers inside string literals are
+left alone) and replaces comments with spaces, keeping newlines, so line and
+column numbers in JSONDecodeError messages still point at the original file.
+Text without a single "/" is returned untouched.
+
+All writes end in write_bytes_if_changed, which leaves a file alone (contents
+and mtime) when it already holds exactly the bytes that would be written, so
+reruns do not trigger resource-pack rebuilds. Scripts that edit existing
+JSONs reach it through json_patch.write_json_patch, which splices their
+changes into the original text. Freshly generated files (item models) go
+through write_json_if_changed. WRITE_COUNTS tallies real writes against
+skipped ones for the scripts' summaries.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+COMMENT_START_RE = re.compile(r"/[/*]")
+# A complete string literal (JSON strings cannot span lines), or a lone quote that opens one
+# which is still unterminated at the search limit.
+STRING_OR_QUOTE_RE = re.compile(r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"|"')
+STRING_RE = re.compile(r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"')
+NON_NEWLINE_RE = re.compile(r"[^\n]")
+
+WRITE_COUNTS = {"written": 0, "unchanged": 0}
+
+
+def strip_json_comments(text: str) -> str:
+    """Replace // and /* */ comments outside string literals with whitespace.
+
+    Only the candidate comment starts are visited: for each one, the string literals
+    between the start of its line (or the end of the previous comment) and the
+    candidate tell whether it sits inside a string. Text before a candidate is never
+    rescanned, so the cost stays linear in the input size.
+    """
+    if "/" not in text:
+        return text
+
+    pieces = []
+    copied = 0      # text[:copied] is already in pieces
+    outside = 0     # a position known to be outside any string literal
+    pos = 0
+    while True:
+        match = COMMENT_START_RE.search(text, pos)
+        if match is None:
+            break
+        start = match.start()
+        scan_from = max(outside, text.rfind("\n", 0, start) + 1)
+        last = None
+        for last in STRING_OR_QUOTE_RE.finditer(text, scan_from, start):
+            pass
+        if last is not None and last.group() == '"':
+            # Inside a string: resume after it (or after the line if it never closes).
+            literal = STRING_RE.match(text, last.start())
+            if literal is not None:
+                outside = pos = literal.end()
+            else:
+                newline = text.find("\n", start)
+                outside = pos = len(text) if newline == -1 else newline
+            continue
+
+        if match.group() == "//":
+            end = text.find("\n", start)
+            end = len(text) if end == -1 else end
+            blank = " " * (end - start)
+        else:
+            end = text.find("*/", start + 2)
+            if end == -1:
+                break  # unterminated block comment: leave it for json.loads to report
+            end += 2
+            blank = NON_NEWLINE_RE.sub(" ", text[start:end])
+        pieces.append(text[copied:start])
+        pieces.append(blank)
+        copied = outside = pos = end
+
+    if not pieces:
+        return text
+    pieces.append(text[copied:])
+    return "".join(pieces)
+
+
+def loads(text: str, allow_comments: bool = True) -> Any:
+    if allow_comments:
+        text = strip_json_comments(text)
+    return json.loads(text)
+
+
+def load_json(path: Union[str, Path], allow_comments: bool = True) -> Any:
+    """Read and parse a UTF-8 JSON file, tolerating comments unless allow_comments is False."""
+    return loads(Path(path).read_text(encoding="utf-8"), allow_comments)
+
+
+def write_text_if_changed(path: Union[str, Path], text: str, encoding: str = "utf-8") -> bool:
+    """Write text as a text-mode write would, unless the file already holds those exact bytes.
+
+    Returns True if the file was written.
+    """
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return write_bytes_if_changed(path, text.encode(encoding))
+
+
+def write_bytes_if_changed(path: Union[str, Path], data: bytes) -> bool:
+    """Write data unless the file already holds exactly these bytes; returns True if it wrote."""
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            WRITE_COUNTS["unchanged"] += 1
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    WRITE_COUNTS["written"] += 1
+    return True
+
+
+def write_json_if_changed(path: Union[str, Path], data: Any, indent: Optional[int] = 4, ensure_ascii: bool = True,
+                          trailing_newline: bool = False, separators: Optional[Tuple[str, str]] = None) -> bool:
+    """Serialize data like json.dump with the given options and write it only if the bytes differ."""
+    text = json.dumps(data, indent=indent, ensure_ascii=ensure_ascii, separators=separators)
+    return write_text_if_changed(path, text + "\n" if trailing_newline else text)
+
+
+def write_summary() -> str:
+    return f"{WRITE_COUNTS['written']} written, {WRITE_COUNTS['unchanged']} already up to date"
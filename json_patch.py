@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Format- and comment-preserving writes for edited JSON documents.
+
+The scripts load a document, change a few things in memory (append a
+connection, a visibility animation, a material entry) and used to write the
+whole document back with json.dumps, which reformats the file and drops its
+comments. Here the edited document is compared against the original text,
+descending only into the subtrees that differ, and only those changes are
+spliced into the original text:
+
+ - appended array items and object members are inserted before the closing
+   bracket, laid out like their siblings (same line, own line, or own line
+   but written on one line);
+ - changed scalars, and containers that changed in any other way (items
+   removed, reordered or inserted mid-list), are replaced in place with a
+   fresh serialization indented to match the surrounding line.
+
+Everything else, including comments and whitespace, is kept byte for byte.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from json.decoder import scanstring
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+from json_io import strip_json_comments, write_bytes_if_changed
+
+WS_RE = re.compile(r"[ \t\r\n]*")
+LEADING_WS_RE = re.compile(r"[ \t]*")
+DEFAULT_INDENT = "    "
+
+_decoder = json.JSONDecoder()
+UNDECODED = object()
+
+# (start, end, replacement text), applied to the original text.
+Splice = Tuple[int, int, str]
+
+
+class Node:
+    """A parsed value and the [start, end) span of its source text."""
+
+    __slots__ = ("start", "end", "value")
+
+    def __init__(self, start: int, end: int, value: Any):
+        self.start = start
+        self.end = end
+        self.value = value
+
+
+# === Span lookup ===
+# The structure is read from the comment-stripped text, which has the same offsets as the
+# original, so whole subtrees can be decoded (and skipped) by the C decoder. Only containers
+# on the path to a change are split into their children.
+
+def node_at(stripped: str, pos: int) -> Node:
+    pos = WS_RE.match(stripped, pos).end()
+    value, end = _decoder.raw_decode(stripped, pos)
+    return Node(pos, end, value)
+
+
+def _expect(stripped: str, pos: int, char: str) -> None:
+    if stripped[pos:pos + 1] != char:
+        raise ValueError(f"Expected {char!r} at offset {pos}")
+
+
+def children(stripped: str, node: Node) -> Tuple[List[Optional[str]], List[Node], List[int]]:
+    """Return the member keys (None for array items), child nodes and entry start offsets of a container.
+
+    An entry starts at its key for object members and at the value for array items.
+    """
+    keys: List[Optional[str]] = []
+    items: List[Node] = []
+    starts: List[int] = []
+    is_object = stripped[node.start] == "{"
+    close = "}" if is_object else "]"
+    cursor = WS_RE.match(stripped, node.start + 1).end()
+    if stripped[cursor:cursor + 1] == close:
+        return keys, items, starts
+    while True:
+        key = None
+        starts.append(cursor)
+        if is_object:
+            _expect(stripped, cursor, '"')
+            key, cursor = scanstring(stripped, cursor + 1)
+            cursor = WS_RE.match(stripped, cursor).end()
+            _expect(stripped, cursor, ":")
+            cursor += 1
+        child = node_at(stripped, cursor)
+        keys.append(key)
+        items.append(child)
+        cursor = WS_RE.match(stripped, child.end).end()
+        if stripped[cursor:cursor + 1] == ",":
+            cursor = WS_RE.match(stripped, cursor + 1).end()
+            continue
+        _expect(stripped, cursor, close)
+        return keys, items, starts
+
+
+def root_node(stripped: str) -> Node:
+    """The document root, left undecoded: it is about to be split into children anyway."""
+    start = WS_RE.match(stripped).end()
+    end = len(stripped.rstrip())
+    if stripped[start:start + 1] not in ("{", "["):
+        return node_at(stripped, start)
+    return Node(start, end, UNDECODED)
+
+
+def _unchanged(old: Any, new: Any) -> bool:
+    """Equality that also tells 1, 1.0 and True apart and notices reordered keys."""
+    if type(old) is not type(new) or old != new:
+        return False
+    # repr is type-strict and order-sensitive, where == is neither.
+    return not isinstance(old, (dict, list)) or repr(old) == repr(new)
+
+
+# === Layout helpers ===
+
+def _line_indent(text: str, pos: int) -> str:
+    line_start = text.rfind("\n", 0, pos) + 1
+    return LEADING_WS_RE.match(text, line_start).group()
+
+
+def _own_line_indent(text: str, pos: int) -> Optional[str]:
+    """The indentation before pos if pos is the first token on its line, else None."""
+    line_start = text.rfind("\n", 0, pos) + 1
+    prefix = text[line_start:pos]
+    return prefix if prefix.strip(" \t") == "" else None
+
+
+def _indent_unit(text: str) -> str:
+    match = re.search(r"\n([ \t]+)\S", text)
+    return match.group(1) if match else DEFAULT_INDENT
+
+
+class _Writer:
+    def __init__(self, text: str, ensure_ascii: bool):
+        self.text = text
+        self.stripped = strip_json_comments(text)
+        self.ensure_ascii = ensure_ascii
+        self.unit = _indent_unit(text)
+        self.newline = "\r\n" if "\r\n" in text else "\n"
+
+    def dumps(self, value: Any, base_indent: str) -> str:
+        """Serialize value as json.dumps(indent=unit) would, with continuation lines shifted by base_indent."""
+        rendered = json.dumps(value, indent=self.unit, ensure_ascii=self.ensure_ascii)
+        return rendered.replace("\n", self.newline + base_indent)
+
+    def dumps_inline(self, value: Any) -> str:
+        return json.dumps(value, ensure_ascii=self.ensure_ascii)
+
+    def entry(self, key: Optional[str], value: Any, base_indent: str, inline: bool) -> str:
+        rendered = self.dumps_inline(value) if inline else self.dumps(value, base_indent)
+        if key is None:
+            return rendered
+        return json.dumps(key, ensure_ascii=self.ensure_ascii) + ": " + rendered
+
+    # === Diffing ===
+
+    def diff(self, node: Node, value: Any, splices: List[Splice]) -> None:
+        if _unchanged(node.value, value):
+            return
+        opener = self.stripped[node.start]
+        if opener == "[" and isinstance(value, list):
+            self.diff_array(node, value, splices)
+        elif opener == "{" and isinstance(value, dict):
+            self.diff_object(node, value, splices)
+        else:
+            self.replace(node, value, splices)
+
+    def diff_array(self, node: Node, value: List[Any], splices: List[Splice]) -> None:
+        _, items, starts = children(self.stripped, node)
+        old_count = len(items)
+        if len(value) < old_count:
+            if not self.remove_items(node, items, value, splices):
+                self.replace(node, value, splices)
+            return
+        child_splices: List[Splice] = []
+        for child, item in zip(items, value):
+            self.diff(child, item, child_splices)
+        if len(value) > old_count and child_splices:
+            # Something changed mid-list as well: positional matching is unreliable, rewrite it.
+            self.replace(node, value, splices)
+            return
+        splices.extend(child_splices)
+        if len(value) > old_count:
+            self.append(node, items, starts, [(None, item) for item in value[old_count:]], splices)
+
+    def diff_object(self, node: Node, value: dict, splices: List[Splice]) -> None:
+        keys, items, starts = children(self.stripped, node)
+        new_keys = list(value)
+        old_count = len(keys)
+        if len(set(keys)) != old_count or new_keys[:old_count] != keys:
+            # Duplicate keys in the source, or members removed or reordered.
+            self.replace(node, value, splices)
+            return
+        for child, key in zip(items, keys):
+            self.diff(child, value[key], splices)
+        if len(new_keys) > old_count:
+            self.append(node, items, starts, [(key, value[key]) for key in new_keys[old_count:]], splices)
+
+    # === Edits ===
+
+    def remove_items(self, node: Node, items: List[Node], value: List[Any], splices: List[Splice]) -> bool:
+        """Cut out the removed items if value is the old list with some items dropped and no other change."""
+        kept = 0
+        removed: List[int] = []
+        for index, child in enumerate(items):
+            if kept < len(value) and _unchanged(child.value, value[kept]):
+                kept += 1
+            else:
+                removed.append(index)
+        if kept != len(value):
+            return False
+        if not value:
+            splices.append((node.start, node.end, "[]"))
+            return True
+        last_kept = max(set(range(len(items))) - set(removed))
+        for index in removed:
+            if index < last_kept:
+                # Take the item, its comma and everything up to the next item.
+                splices.append((items[index].start, items[index + 1].start, ""))
+        if last_kept < len(items) - 1:
+            # Trailing items: take the comma after the last kept item through the final item.
+            splices.append((items[last_kept].end, items[-1].end, ""))
+        return True
+
+    def replace(self, node: Node, value: Any, splices: List[Splice]) -> None:
+        splices.append((node.start, node.end, self.dumps(value, _line_indent(self.text, node.start))))
+
+    def append(self, node: Node, items: List[Node], starts: List[int], entries: List[Tuple[Optional[str], Any]],
+               splices: List[Splice]) -> None:
+        text = self.text
+        close = node.end - 1
+        if not items:
+            # Empty container: lay it out the way json.dumps(indent=...) would.
+            base = _line_indent(text, node.start)
+            inner = base + self.unit
+            body = ("," + self.newline + inner).join(self.entry(key, item, inner, False) for key, item in entries)
+            splices.append((node.start + 1, close, self.newline + inner + body + self.newline + base))
+            return
+
+        last = items[-1]
+        # Layout is judged from where the last entry starts: its key, for object members.
+        item_indent = _own_line_indent(text, starts[-1])
+        if item_indent is None:
+            # Items share a line: continue the line.
+            body = "".join(", " + self.entry(key, item, "", True) for key, item in entries)
+            splices.append((last.end, last.end, body))
+            return
+
+        # One item per line. The comma goes right after the last item so a trailing
+        # comment stays with it; new items go after that comment, before the bracket.
+        # If the last item is a container written on a single line, new items are too.
+        inline = isinstance(last.value, (dict, list)) and bool(last.value) and "\n" not in text[last.start:last.end]
+        tail = close
+        while tail > last.end and text[tail - 1] in " \t\r\n":
+            tail -= 1
+        body = "".join("," * (index > 0) + self.newline + item_indent + self.entry(key, item, item_indent, inline)
+                       for index, (key, item) in enumerate(entries))
+        if tail == last.end:
+            splices.append((last.end, last.end, "," + body))
+        else:
+            splices.append((last.end, last.end, ","))
+            splices.append((tail, tail, body))
+
+
+def patch_text(text: str, data: Any, ensure_ascii: bool = True) -> str:
+    """Return text edited so it parses to data, changing only the parts that differ."""
+    writer = _Writer(text, ensure_ascii)
+    root = root_node(writer.stripped)
+    splices: List[Splice] = []
+    writer.diff(root, data, splices)
+    if not splices:
+        return text
+    pieces = []
+    copied = 0
+    for start, end, replacement in sorted(splices, key=lambda splice: splice[0]):
+        if start < copied:
+            raise ValueError("Overlapping JSON edits")
+        pieces.append(text[copied:start])
+        pieces.append(replacement)
+        copied = end
+    pieces.append(text[copied:])
+    return "".join(pieces)
+
+
+def write_json_patch(path: Union[str, Path], data: Any, ensure_ascii: bool = True,
+                     source: Union[str, Path, None] = None) -> bool:
+    """Write data to path by patching the text of source (default: path itself).
+
+    Returns True if the file changed. Falls back to a full json.dumps(indent=4)
+    rewrite if the source is missing or cannot be parsed.
+    """
+    path = Path(path)
+    try:
+        text = Path(source or path).read_bytes().decode("utf-8")
+        patched = patch_text(text, data, ensure_ascii)
+    except (OSError, ValueError):
+        patched = json.dumps(data, indent=4, ensure_ascii=ensure_ascii) + "\n"
+    return write_bytes_if_changed(path, patched.encode("utf-8"))
@@ -1,12 +1,13 @@
 import argparse
-import json
 from pathlib import Path
 from typing import Any
 
+from json_io import load_json, write_summary
+from json_patch import write_json_patch
+
 
 def load_mapping(mapping_path: Path) -> dict[str, list[str]]:
-    with mapping_path.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
+    payload = load_json(mapping_path)
 
     replacements = payload.get("replacements", {})
     normalized: dict[str, list[str]] = {}
@@ -50,15 +51,12 @@ def replace_in_json_node(node: Any, replacements: dict[str, list[str]]) -> tuple
 
 
 def process_file(file_path: Path, replacements: dict[str, list[str]], dry_run: bool) -> int:
-    with file_path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+    data = load_json(file_path)
 
     updated_data, replacements_done = replace_in_json_node(data, replacements)
 
     if replacements_done > 0 and not dry_run:
-        with file_path.open("w", encoding="utf-8") as handle:
-            json.dump(updated_data, handle, indent=4, ensure_ascii=False)
-            handle.write("\n")
+        write_json_patch(file_path, updated_data, ensure_ascii=False)
 
     return replacements_done
 
@@ -121,6 +119,8 @@ def main() -> None:
         f"{mode} complete. Scanned {files_scanned} files, "
         f"changed {files_changed}, total replacements {total_replacements}."
     )
+    if not args.dry_run:
+        print(f"Writes: {write_summary()}.")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 import os
-import json
 import math
 
+from json_io import load_json, write_summary
+from json_patch import write_json_patch
+
 # === Define your wool-to-upholstery mapping ===
 WOOL_TO_UPHOLSTERY = {
     frozenset(["minecraft:wool:7", "minecraft:wool:8"]): "gray",
@@ -50,10 +52,8 @@ def update_material_list(materials):
     new_materials.append(f"{UPHOLSTERY_PREFIX}{upholstery_color}:0:{upholstery_count}")
     return new_materials
 
-def process_json_file(path, out_path=None):
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
+def convert_upholstery(data):
+    """Swap wool for upholstery piles in every extra material list; returns True if anything changed."""
     changed = False
 
     if "definitions" in data:
@@ -64,12 +64,17 @@ def process_json_file(path, out_path=None):
                     if updated_list != material_list:
                         definition["extraMaterialLists"][i] = updated_list
                         changed = True
+    return changed
+
+def process_json_file(path, out_path=None):
+    data = load_json(path)
 
-    if changed:
+    if convert_upholstery(data):
         out_file = out_path or path
-        with open(out_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-        print(f"[OK] Updated: {os.path.basename(path)}")
+        if write_json_patch(out_file, data, source=path):
+            print(f"[OK] Updated: {os.path.basename(path)}")
+        else:
+            print(f"[--] Already up to date: {os.path.basename(path)}")
     else:
         print(f"[--] No change: {os.path.basename(path)}")
 
@@ -94,3 +99,4 @@ if __name__ == "__main__":
 
     os.makedirs(output_folder, exist_ok=True)
     batch_process_folder(input_folder, output_folder)
+    print(f"[SUMMARY] Writes: {write_summary()}")
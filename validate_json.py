@@ -3,49 +3,30 @@
 
 Defaults to tolerating comments (// and /* */) commonly found in asset JSONs.
 Use --no-comments for strict RFC 8259 JSON validation.
+With --jobs N, files are validated in chunks across N worker processes; the
+report is still printed in sorted path order.
+
+Results are cached in <root>/.validate_json.cache, keyed on each file's size,
+mtime and content hash plus the validation mode. Unchanged files are not
+reparsed and their cached failures are reported again. Use --no-cache to
+validate everything from scratch.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-import re
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List
-
-
-COMMENT_BLOCK_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+from typing import Any, Dict, Iterator, List, Tuple
 
+from file_index import hash_file
+from json_io import strip_json_comments
 
-def strip_json_comments(text: str) -> str:
-    # Remove block comments first
-    text = COMMENT_BLOCK_RE.sub("", text)
-    # Remove line comments // outside of strings
-    out_lines: List[str] = []
-    for line in text.splitlines():
-        if "//" not in line:
-            out_lines.append(line)
-            continue
-        new_line_chars: List[str] = []
-        in_string = False
-        escape = False
-        i = 0
-        while i < len(line):
-            ch = line[i]
-            if ch == '"' and not escape:
-                in_string = not in_string
-            if not in_string and ch == '/' and i + 1 < len(line) and line[i + 1] == '/':
-                # start of line comment outside string
-                break
-            new_line_chars.append(ch)
-            if ch == '\\' and not escape:
-                escape = True
-            else:
-                escape = False
-            i += 1
-        out_lines.append(''.join(new_line_chars))
-    return "\n".join(out_lines)
+CACHE_NAME = ".validate_json.cache"
+CACHE_VERSION = 1
 
 
 def validate_file(path: Path, allow_comments: bool) -> tuple[bool, str | None]:
@@ -65,6 +46,150 @@ def validate_file(path: Path, allow_comments: bool) -> tuple[bool, str | None]:
         return False, f"parse error: {e}"
 
 
+def validate_chunk(paths: List[Path], allow_comments: bool, fail_fast: bool) -> List[tuple[bool, str | None]]:
+    results = []
+    for path in paths:
+        valid, err = validate_file(path, allow_comments)
+        results.append((valid, err))
+        if fail_fast and not valid:
+            break
+    return results
+
+
+def chunk_size(file_count: int, jobs: int) -> int:
+    # About four chunks per worker keeps them busy without paying pickling costs per file.
+    return max(1, min(64, -(-file_count // (jobs * 4))))
+
+
+def validate_serial(files: List[Path], allow_comments: bool) -> Iterator[Tuple[Path, bool, str | None]]:
+    for f in files:
+        valid, err = validate_file(f, allow_comments)
+        yield f, valid, err
+
+
+def validate_parallel(files: List[Path], allow_comments: bool, jobs: int,
+                      fail_fast: bool) -> Iterator[Tuple[Path, bool, str | None]]:
+    """Validate in a process pool, yielding results in the order of files.
+
+    With fail_fast, the first chunk to report a failure cancels every later chunk
+    that has not started; earlier chunks still finish, since one of them may hold
+    a failure that comes first in sorted order.
+    """
+    size = chunk_size(len(files), jobs)
+    chunks = [files[i:i + size] for i in range(0, len(files), size)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(validate_chunk, chunk, allow_comments, fail_fast) for chunk in chunks]
+        if fail_fast:
+            for done in as_completed(futures):
+                if any(not valid for valid, _ in done.result()):
+                    failed_at = futures.index(done)
+                    for pending in futures[failed_at + 1:]:
+                        pending.cancel()
+                    futures = futures[:failed_at + 1]
+                    break
+        for chunk, future in zip(chunks, futures):
+            for f, (valid, err) in zip(chunk, future.result()):
+                yield f, valid, err
+
+
+# === Result cache ===
+
+def load_cache(cache_path: Path) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Return {mode: {relative path: record}} from the cache file, or {} if it is missing or outdated."""
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("entries", {})
+
+
+def save_cache(cache_path: Path, entries: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+    # Compact output keeps the C encoder in play; the cache is rewritten only when it changed.
+    text = json.dumps({"version": CACHE_VERSION, "entries": entries}, separators=(",", ":"), sort_keys=True)
+    try:
+        if cache_path.read_text(encoding="utf-8") == text:
+            return
+    except OSError:
+        pass
+    temp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        temp_path.write_text(text, encoding="utf-8")
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        # The cache is only an optimisation: a read-only tree must not fail validation.
+        print(f"[WARN] Could not write {cache_path}: {e}")
+
+
+def fingerprint(path: Path) -> Dict[str, Any]:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def cached_result(record: Dict[str, Any] | None, path: Path) -> Dict[str, Any] | None:
+    """Return the cached record if the file is unchanged since it was validated.
+
+    A size match with a different mtime falls back to the content hash, so touched
+    but unedited files still hit the cache.
+    """
+    if not record:
+        return None
+    try:
+        current = fingerprint(path)
+    except OSError:
+        return None
+    if current["size"] != record.get("size"):
+        return None
+    if current["mtime_ns"] != record.get("mtime_ns"):
+        if hash_file(path) != record.get("sha1"):
+            return None
+        record["mtime_ns"] = current["mtime_ns"]
+    return record
+
+
+def validate_with_cache(files: List[Path], keys: Dict[Path, str], entries: Dict[str, Dict[str, Any]],
+                        validate_stale) -> Iterator[Tuple[Path, bool, str | None]]:
+    """Yield results in the order of files, validating only files the cache cannot answer.
+
+    keys maps each file to its cache key and entries holds the records for one
+    validation mode. validate_stale(paths) must yield
+    (path, valid, err) in the order given. Entries for validated files are refreshed as
+    results come in, unless the file changed while it was being validated.
+    """
+    hits: Dict[Path, Dict[str, Any]] = {}
+    stale: List[Path] = []
+    stamps: Dict[Path, Dict[str, Any]] = {}
+    for f in files:
+        record = cached_result(entries.get(keys[f]), f)
+        if record is not None:
+            hits[f] = record
+            continue
+        stale.append(f)
+        try:
+            # Stat before the file is read so an edit during validation invalidates the entry.
+            stamps[f] = fingerprint(f)
+        except OSError:
+            pass
+
+    fresh = validate_stale(stale) if stale else iter(())
+    for f in files:
+        record = hits.get(f)
+        if record is not None:
+            yield f, record["valid"], record["error"]
+            continue
+        f, valid, err = next(fresh)
+        if f in stamps:
+            try:
+                sha1 = hash_file(f)
+                unchanged = fingerprint(f) == stamps[f]
+            except OSError:
+                unchanged = False
+            if unchanged:
+                entries[keys[f]] = dict(stamps[f], sha1=sha1, valid=valid, error=err)
+        yield f, valid, err
+
+
 def main(argv: List[str]) -> int:
     p = argparse.ArgumentParser(description="Validate JSON files recursively")
     p.add_argument("root", help="Root directory to scan")
@@ -72,6 +197,8 @@ def main(argv: List[str]) -> int:
     p.add_argument("--glob", default="*.json", help="Glob pattern for files (default: *.json)")
     p.add_argument("--quiet", "-q", action="store_true", help="Only print summary")
     p.add_argument("--fail-fast", action="store_true", help="Exit on first error with non-zero code")
+    p.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes (default: 1, validate in-process)")
+    p.add_argument("--no-cache", action="store_true", help=f"Ignore and do not update {CACHE_NAME}")
     args = p.parse_args(argv)
 
     root = Path(args.root)
@@ -85,18 +212,41 @@ def main(argv: List[str]) -> int:
 
     ok_count = 0
     err_count = 0
-    for f in files:
-        valid, err = validate_file(f, allow_comments=not args.no_comments)
-        if valid:
-            ok_count += 1
-            if not args.quiet:
-                print(f"OK   {f}")
-        else:
-            err_count += 1
-            print(f"FAIL {f}: {err}")
-            if args.fail_fast:
-                print(f"[SUMMARY] OK: {ok_count}  FAIL: {err_count}")
-                return 1
+    allow_comments = not args.no_comments
+
+    def validate_files(paths: List[Path]) -> Iterator[Tuple[Path, bool, str | None]]:
+        if args.jobs > 1 and len(paths) > 1:
+            return validate_parallel(paths, allow_comments, args.jobs, args.fail_fast)
+        return validate_serial(paths, allow_comments)
+
+    cache_path = root / CACHE_NAME
+    if args.no_cache:
+        results = validate_files(files)
+    else:
+        entries = load_cache(cache_path)
+        mode = "comments" if allow_comments else "strict"
+        keys = {f: f.relative_to(root).as_posix() for f in files}
+        results = validate_with_cache(files, keys, entries.setdefault(mode, {}), validate_files)
+
+    try:
+        for f, valid, err in results:
+            if valid:
+                ok_count += 1
+                if not args.quiet:
+                    print(f"OK   {f}")
+            else:
+                err_count += 1
+                print(f"FAIL {f}: {err}")
+                if args.fail_fast:
+                    print(f"[SUMMARY] OK: {ok_count}  FAIL: {err_count}")
+                    return 1
+    finally:
+        if not args.no_cache:
+            results.close()
+            listed = set(keys.values())
+            entries = {name: {key: record for key, record in records.items() if key in listed or (root / key).is_file()}
+                       for name, records in entries.items()}
+            save_cache(cache_path, entries)
 
     print(f"[SUMMARY] OK: {ok_count}  FAIL: {err_count}")
     return 0 if err_count == 0 else 1
@@ -1,38 +1,45 @@
 import os
-import json
+import sys
 import random
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 
-# Parse the folder path from the command line
-parser = argparse.ArgumentParser(description="Add 'damaged' animations to JSON files or a single JSON file")
-parser.add_argument("--folder_path", required=True, help="Path to the folder containing JSON files or a single .json file")
-args = parser.parse_args()
-folder_path = os.path.normpath(args.folder_path)
+from json_io import load_json
+from json_patch import write_json_patch
 
-# Function to add "damaged" animations to a JSON file
-def add_damaged_animation(json_file):
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+def _silent(*args, **kwargs):
+    pass
+
+def file_rng(seed, relative_path):
+    """RNG for one file, derived from the run seed and the file's path relative to the scanned folder.
+
+    Axes then depend only on (seed, file), never on processing order or worker count.
+    """
+    return random.Random(f"{seed}:{relative_path.replace(os.sep, '/')}")
 
-    print(f"inside a json file: {json_file}")
+# Add "damaged" animations to a parsed vehicle definition, in place
+def add_damage_animations(data, rng=random, log=print):
+    """Returns (added, removed) counts of damage_totaled animations; log=None keeps it silent."""
+    log = log or _silent
+    added = removed = 0
 
     for obj in data["rendering"]["animatedObjects"]:
-        print(f"inside an object: {obj['objectName']}")
+        log(f"inside an object: {obj['objectName']}")
         #print the number of animations in the object
-        print(f"number of animations: {len(obj.get('animations', []))}")
+        log(f"number of animations: {len(obj.get('animations', []))}")
         # if this animation has not already been added
         if not any(anim.get("variable", None) == "damage_totaled" for anim in obj.get("animations", []) ):
-            print("damage_totaled animation does not exist")
+            log("damage_totaled animation does not exist")
             # Iterate through each animation in the object
             # Collect new animations first to avoid mutating the list while iterating
             new_animations = []
             for anim in obj.get("animations", []):
                 # If animation not of "variable" "damage_totaled"
                 if anim.get("variable", None) != "damage_totaled":
-                    print(f"inside an animation: type {anim.get('animationType')}, variable {anim.get('variable')}")
+                    log(f"inside an animation: type {anim.get('animationType')}, variable {anim.get('variable')}")
                     # inside the animation, get the "centerPoint" key
                     center_point = anim.get("centerPoint", None)
-                    print(f"center point: {center_point}")
+                    log(f"center point: {center_point}")
 
                     # Determine whether center_point is valid. Support both dict {x,y,z} and list/tuple [x,y,z].
                     valid_center = False
@@ -54,58 +61,115 @@ def add_damaged_animation(json_file):
                             "variable": "damage_totaled",
                             "centerPoint": center_point,
                             "axis": [
-                                round(random.uniform(-10, 10), 3),
-                                round(random.uniform(-10, 10), 3),
-                                round(random.uniform(-10, 10), 3)
+                                round(rng.uniform(-10, 10), 3),
+                                round(rng.uniform(-10, 10), 3),
+                                round(rng.uniform(-10, 10), 3)
                             ]
                         }
-                        print(f"new animation: {new_anim}")
+                        log(f"new animation: {new_anim}")
 
                         # Queue the new animation to add after iteration
                         new_animations.append(new_anim)
                     else:
-                        print("Skipping damaged animation due to invalid centerPoint or coordinates")
+                        log("Skipping damaged animation due to invalid centerPoint or coordinates")
 
             # Add any newly-created animations to the object's animations list
             if new_animations:
                 obj.setdefault("animations", []).extend(new_animations)
+                added += len(new_animations)
         else:
-            print("damage_totaled animation already exists")
+            log("damage_totaled animation already exists")
             # for all the animation, if of type "damage_totaled", but "centerPoint": null, then delete the animation
             for anim in obj.get("animations", []):
                 if anim.get("variable", None) == "damage_totaled" and anim.get("centerPoint", None) == None:
                     obj["animations"].remove(anim)
-                    print("removed damage_totaled animation due to null centerPoint")
-            
-        
-
-    # Save the modified JSON file
-    with open(json_file, 'w') as f:
-        json.dump(data, f, indent=4)
-
-# If the provided path is a single JSON file, process only that file.
-if os.path.isfile(folder_path):
-    if folder_path.lower().endswith('.json'):
-        try:
-            add_damaged_animation(folder_path)
-            print(f"Modified: {folder_path}")
-        except Exception as e:
-            print(f"Error processing {folder_path}: {e}")
-    else:
-        print(f"Provided path is a file but not a JSON: {folder_path}")
-# If the provided path is a directory, walk it as before.
-elif os.path.isdir(folder_path):
+                    removed += 1
+                    log("removed damage_totaled animation due to null centerPoint")
+
+    return added, removed
+
+# Function to add "damaged" animations to a JSON file
+def damage_file(json_file, relative_path, seed, verbose=True):
+    """Process one file; safe to run in a worker process.
+
+    Returns a result dict (path, status, error, added, removed, log). Log lines are
+    collected rather than printed so parallel runs report in a stable order.
+    """
+    lines = []
+    result = {"path": json_file, "status": "unchanged", "error": None, "added": 0, "removed": 0, "log": lines}
+    log = lines.append if verbose else None
+    try:
+        data = load_json(json_file)
+        if log:
+            log(f"inside a json file: {json_file}")
+        result["added"], result["removed"] = add_damage_animations(data, file_rng(seed, relative_path), log)
+        if write_json_patch(json_file, data):
+            result["status"] = "modified"
+    except Exception as e:
+        result["status"], result["error"] = "error", str(e)
+    return result
+
+def _damage_file_args(args):
+    return damage_file(*args)
+
+def find_json_files(folder_path):
+    """Return (path, path relative to folder_path) for every .json file below it, sorted."""
+    found = []
     for root, _, files in os.walk(folder_path):
         for file_name in files:
             if file_name.endswith(".json"):
                 file_path = os.path.join(root, file_name)
-                # try to add a damaged animation to the file
-                try:
-                    add_damaged_animation(file_path)
-                    print(f"Modified: {file_path}")
-                except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
-else:
-    print(f"Provided path does not exist: {folder_path}")
-
-print("Done!")
+                found.append((file_path, os.path.relpath(file_path, folder_path)))
+    return sorted(found)
+
+def damage_files(files, seed, jobs=1, verbose=True):
+    """Yield damage_file results for (path, relative path) pairs, in the order given."""
+    work = [(path, relative_path, seed, verbose) for path, relative_path in files]
+    if jobs <= 1 or len(work) <= 1:
+        yield from map(_damage_file_args, work)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(_damage_file_args, work, chunksize=max(1, min(32, len(work) // (jobs * 4))))
+
+def main(argv=None):
+    # Parse the folder path from the command line
+    parser = argparse.ArgumentParser(description="Add 'damaged' animations to JSON files or a single JSON file")
+    parser.add_argument("--folder_path", required=True, help="Path to the folder containing JSON files or a single .json file")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Run seed; each file's axes come from this seed plus its relative path (default: 0)")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument("--quiet", action="store_true", help="Only print errors and a summary of counts")
+    args = parser.parse_args(argv)
+    folder_path = os.path.normpath(args.folder_path)
+
+    # If the provided path is a single JSON file, process only that file.
+    if os.path.isfile(folder_path):
+        if not folder_path.lower().endswith('.json'):
+            print(f"Provided path is a file but not a JSON: {folder_path}")
+            return 1
+        files = [(folder_path, os.path.basename(folder_path))]
+    # If the provided path is a directory, walk it as before.
+    elif os.path.isdir(folder_path):
+        files = find_json_files(folder_path)
+    else:
+        print(f"Provided path does not exist: {folder_path}")
+        return 1
+
+    counts = {"modified": 0, "unchanged": 0, "error": 0, "added": 0, "removed": 0}
+    for result in damage_files(files, args.seed, args.jobs, verbose=not args.quiet):
+        counts[result["status"]] += 1
+        counts["added"] += result["added"]
+        counts["removed"] += result["removed"]
+        for line in result["log"]:
+            print(line)
+        if result["status"] == "error":
+            print(f"Error processing {result['path']}: {result['error']}")
+        elif not args.quiet:
+            print(f"{result['status'].capitalize()}: {result['path']}")
+
+    print(f"Done! Files: {len(files)} ({counts['modified']} modified, {counts['unchanged']} unchanged, "
+          f"{counts['error']} errors). Animations: {counts['added']} added, {counts['removed']} removed.")
+    return 0 if counts["error"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""Persistent structural index of vehicle JSON definitions.
+
+Stores, in a SQLite database, the parts of every JSON definition under a root
+that the maintenance scripts ask about: animated objects and variable
+modifiers with their animations, connection groups and connections,
+definitions[].extraMaterialLists entries and texture references. Updates are
+incremental (see file_index.py): only definitions whose size, mtime and
+content hash changed are parsed again.
+
+Scripts use the query functions to pick the few files worth opening, for
+example tow_flatbed_candidates() for add_tow_flatbed.py --index.
+
+Usage:
+    python vehicle_index.py update path/to/assets
+    python vehicle_index.py query path/to/assets --group HOOKUP
+    python vehicle_index.py query path/to/assets --missing-animation damage_totaled
+    python vehicle_index.py query path/to/assets --material minecraft:wool:14
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import file_index
+from json_io import load_json
+
+DB_NAME = ".vehicle_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS animations (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    owner TEXT,
+    animation_type TEXT,
+    variable TEXT
+);
+CREATE TABLE IF NOT EXISTS connection_groups (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    name TEXT,
+    PRIMARY KEY (file_id, ordinal)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS connections (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    group_ordinal INTEGER NOT NULL,
+    type TEXT,
+    x REAL,
+    y REAL,
+    z REAL
+);
+CREATE TABLE IF NOT EXISTS materials (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    definition TEXT,
+    list_index INTEGER NOT NULL,
+    item TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS textures (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    reference TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_by_file ON objects(file_id);
+CREATE INDEX IF NOT EXISTS animations_by_file ON animations(file_id);
+CREATE INDEX IF NOT EXISTS animations_by_variable ON animations(variable);
+CREATE INDEX IF NOT EXISTS connection_groups_by_name ON connection_groups(name);
+CREATE INDEX IF NOT EXISTS connections_by_file ON connections(file_id, group_ordinal);
+CREATE INDEX IF NOT EXISTS connections_by_type ON connections(type);
+CREATE INDEX IF NOT EXISTS materials_by_file ON materials(file_id);
+CREATE INDEX IF NOT EXISTS materials_by_item ON materials(item);
+CREATE INDEX IF NOT EXISTS textures_by_file ON textures(file_id);
+CREATE INDEX IF NOT EXISTS textures_by_reference ON textures(reference);
+"""
+
+# Tables holding one file's extracted rows, in the column order extract_definition produces.
+ROW_TABLES = {
+    "objects": ("kind", "name"),
+    "animations": ("kind", "owner", "animation_type", "variable"),
+    "connection_groups": ("ordinal", "name"),
+    "connections": ("group_ordinal", "type", "x", "y", "z"),
+    "materials": ("definition", "list_index", "item"),
+    "textures": ("source", "reference"),
+}
+
+Rows = Dict[str, List[Tuple[Any, ...]]]
+
+
+def open_index(db_path: Path) -> sqlite3.Connection:
+    return file_index.open_index(db_path, SCHEMA)
+
+
+def iter_definitions(root: Path) -> List[Path]:
+    return sorted(p for p in root.rglob("*.json") if p.is_file())
+
+
+# === Extraction ===
+
+def _text(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+def _position(pos: Any) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    # The same test add_tow_flatbed.extract_positions applies; anything else is stored as NULLs.
+    if isinstance(pos, list) and len(pos) == 3 and all(isinstance(v, (int, float)) for v in pos):
+        return float(pos[0]), float(pos[1]), float(pos[2])
+    return None, None, None
+
+
+def _animated(rows: Rows, kind: str, entries: Any, name_key: str) -> None:
+    if not isinstance(entries, list):
+        return
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        name = _text(entry.get(name_key))
+        rows["objects"].append((kind, name))
+        animations = entry.get("animations")
+        for anim in animations if isinstance(animations, list) else []:
+            if isinstance(anim, dict):
+                rows["animations"].append((kind, name, _text(anim.get("animationType")), _text(anim.get("variable"))))
+
+
+def extract_definition(data: Any, stem: str) -> Rows:
+    """Return the index rows for one parsed definition, keyed by table name."""
+    rows: Rows = {table: [] for table in ROW_TABLES}
+    if not isinstance(data, dict):
+        return rows
+
+    rendering = data.get("rendering")
+    if isinstance(rendering, dict):
+        _animated(rows, "object", rendering.get("animatedObjects"), "objectName")
+        names = rendering.get("textureObjectNames")
+        for name in names if isinstance(names, list) else []:
+            if isinstance(name, str):
+                rows["textures"].append(("textureObjectNames", name))
+    _animated(rows, "modifier", data.get("variableModifiers"), "variable")
+
+    groups = data.get("connectionGroups")
+    for ordinal, group in enumerate(groups if isinstance(groups, list) else []):
+        if not isinstance(group, dict):
+            continue
+        rows["connection_groups"].append((ordinal, _text(group.get("groupName"))))
+        connections = group.get("connections")
+        for connection in connections if isinstance(connections, list) else []:
+            if isinstance(connection, dict):
+                rows["connections"].append((ordinal, _text(connection.get("type"))) + _position(connection.get("pos")))
+
+    definitions = data.get("definitions")
+    for definition in definitions if isinstance(definitions, list) else []:
+        if not isinstance(definition, dict):
+            continue
+        sub_name = _text(definition.get("subName"))
+        if sub_name is not None:
+            # Skins are looked up as <file name><subName>.png.
+            rows["textures"].append(("skin", stem + sub_name))
+        texture_name = _text(definition.get("textureName"))
+        if texture_name is not None:
+            rows["textures"].append(("textureName", texture_name))
+        lists = definition.get("extraMaterialLists")
+        for list_index, materials in enumerate(lists if isinstance(lists, list) else []):
+            for item in materials if isinstance(materials, list) else []:
+                if isinstance(item, str):
+                    rows["materials"].append((sub_name, list_index, item))
+    return rows
+
+
+def scan_definition(path: str) -> Tuple[str, Optional[Rows], Optional[str]]:
+    """Parse one file and extract its rows; safe to run in a worker process."""
+    try:
+        data = load_json(path)
+    except Exception as e:
+        return path, None, str(e)
+    return path, extract_definition(data, Path(path).stem), None
+
+
+# === Updates ===
+
+def store_rows(conn: sqlite3.Connection, file_id: int, rows: Rows) -> None:
+    for table, columns in ROW_TABLES.items():
+        if rows[table]:
+            placeholders = ", ".join("?" * (len(columns) + 1))
+            conn.executemany(f"INSERT INTO {table} (file_id, {', '.join(columns)}) VALUES ({placeholders})",
+                             [(file_id,) + row for row in rows[table]])
+
+
+def update_index(conn: sqlite3.Connection, root: Path, workers: Optional[int] = None) -> Dict[str, int]:
+    """Bring the index in line with the JSON files under root; returns counts of what was done.
+
+    Files that fail to parse are recorded with their error, so they are not retried until they change.
+    """
+    return file_index.update_index(conn, root, iter_definitions(root), list(ROW_TABLES), scan_definition, store_rows,
+                                   workers, chunksize=16, failure="JSON parse failed for")
+
+
+# === Queries ===
+# All queries return paths relative to the indexed root, sorted, and ignore files that failed to parse.
+
+def files_with_group(conn: sqlite3.Connection, group_name: str) -> List[str]:
+    rows = conn.execute(
+        "SELECT DISTINCT f.path FROM connection_groups g JOIN files f ON f.id = g.file_id "
+        "WHERE g.name = ? ORDER BY f.path",
+        (group_name,),
+    )
+    return [row[0] for row in rows]
+
+
+def files_with_connection(conn: sqlite3.Connection, connection_type: str, group_name: Optional[str] = None) -> List[str]:
+    """Files with a connection of this type, optionally only inside groups with this name."""
+    rows = conn.execute(
+        "SELECT DISTINCT f.path FROM connections c JOIN files f ON f.id = c.file_id "
+        "JOIN connection_groups g ON g.file_id = c.file_id AND g.ordinal = c.group_ordinal "
+        "WHERE c.type = ? AND (? IS NULL OR g.name = ?) ORDER BY f.path",
+        (connection_type, group_name, group_name),
+    )
+    return [row[0] for row in rows]
+
+
+def objects_missing_animation(conn: sqlite3.Connection, variable: str) -> List[Tuple[str, str]]:
+    """Return (path, objectName) for animated objects with no animation on this variable."""
+    rows = conn.execute(
+        "SELECT f.path, o.name FROM objects o JOIN files f ON f.id = o.file_id "
+        "WHERE o.kind = 'object' AND NOT EXISTS ("
+        "    SELECT 1 FROM animations a WHERE a.file_id = o.file_id AND a.kind = 'object' "
+        "    AND a.owner IS o.name AND a.variable = ?) "
+        "ORDER BY f.path, o.name",
+        (variable,),
+    )
+    return rows.fetchall()
+
+
+def files_with_material(conn: sqlite3.Connection, material: str) -> List[Tuple[str, Optional[str], str]]:
+    """Return (path, subName, item) for extraMaterialLists entries naming this material.
+
+    "minecraft:wool:14" matches "minecraft:wool:14" itself and any entry extending it
+    with more ":"-separated fields, such as "minecraft:wool:14:6", but not "minecraft:wool:1".
+    """
+    rows = conn.execute(
+        "SELECT f.path, m.definition, m.item FROM materials m JOIN files f ON f.id = m.file_id "
+        "WHERE m.item = ? OR substr(m.item, 1, length(?) + 1) = ? || ':' "
+        "ORDER BY f.path, m.definition, m.list_index",
+        (material, material, material),
+    )
+    return rows.fetchall()
+
+
+def files_with_texture(conn: sqlite3.Connection, reference: str) -> List[Tuple[str, str]]:
+    """Return (path, source) for definitions referencing this texture name."""
+    rows = conn.execute(
+        "SELECT DISTINCT f.path, t.source FROM textures t JOIN files f ON f.id = t.file_id "
+        "WHERE t.reference = ? ORDER BY f.path, t.source",
+        (reference,),
+    )
+    return rows.fetchall()
+
+
+def tow_flatbed_candidates(conn: sqlite3.Connection) -> List[str]:
+    """Files add_tow_flatbed would change: the first HOOKUP group has no tow_flatbed yet,
+    but has a tow_wheel and a tow_bumper with a numeric [x, y, z] pos."""
+    rows = conn.execute(
+        "WITH hookup AS ("
+        "    SELECT file_id, MIN(ordinal) AS ordinal FROM connection_groups WHERE name = 'HOOKUP' GROUP BY file_id) "
+        "SELECT f.path FROM hookup h JOIN files f ON f.id = h.file_id "
+        "WHERE NOT EXISTS (SELECT 1 FROM connections c WHERE c.file_id = h.file_id "
+        "                  AND c.group_ordinal = h.ordinal AND c.type = 'tow_flatbed') "
+        "AND EXISTS (SELECT 1 FROM connections c WHERE c.file_id = h.file_id "
+        "            AND c.group_ordinal = h.ordinal AND c.type = 'tow_wheel' AND c.x IS NOT NULL) "
+        "AND EXISTS (SELECT 1 FROM connections c WHERE c.file_id = h.file_id "
+        "            AND c.group_ordinal = h.ordinal AND c.type = 'tow_bumper' AND c.x IS NOT NULL) "
+        "ORDER BY f.path"
+    )
+    return [row[0] for row in rows]
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Maintain and query a structural index of vehicle JSON definitions.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    update_parser = subparsers.add_parser("update", help="Reparse definitions that changed since the last update.")
+    update_parser.add_argument("root", help="Root directory containing the JSON definitions.")
+
+    query_parser = subparsers.add_parser("query", help="List the definitions matching a structural question.")
+    query_parser.add_argument("root", help="Root directory the index was built for.")
+    question = query_parser.add_mutually_exclusive_group(required=True)
+    question.add_argument("--group", help="Files with a connection group of this name, e.g. HOOKUP.")
+    question.add_argument("--connection", help="Files with a connection of this type, e.g. tow_flatbed.")
+    question.add_argument("--missing-animation", metavar="VARIABLE",
+                          help="Animated objects with no animation on this variable, e.g. damage_totaled.")
+    question.add_argument("--material", help="Definitions whose extraMaterialLists use this item, e.g. minecraft:wool:14.")
+    question.add_argument("--texture", help="Files referencing this texture name.")
+    question.add_argument("--tow-flatbed-candidates", action="store_true",
+                          help="Files add_tow_flatbed.py would add a tow_flatbed connection to.")
+    query_parser.add_argument("--update", action="store_true", help="Refresh the index before querying.")
+    query_parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+
+    for sub in (update_parser, query_parser):
+        sub.add_argument("--db", help=f"Index database path (default: <root>/{DB_NAME}).")
+        sub.add_argument("--workers", type=int, default=None, help="Worker processes for reparsing (default: CPU count).")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root).resolve()
+    if not root.is_dir():
+        print(f"[ERROR] Not a directory: {root}")
+        return 2
+    conn = open_index(Path(args.db) if args.db else root / DB_NAME)
+    try:
+        if args.command == "update" or args.update:
+            stats = update_index(conn, root, args.workers)
+            if args.command == "update":
+                print("[SUMMARY] " + "  ".join(f"{name}: {count}" for name, count in stats.items()))
+                return 0
+
+        if args.group:
+            results: List[Any] = files_with_group(conn, args.group)
+        elif args.connection:
+            results = files_with_connection(conn, args.connection)
+        elif args.missing_animation:
+            results = objects_missing_animation(conn, args.missing_animation)
+        elif args.material:
+            results = files_with_material(conn, args.material)
+        elif args.texture:
+            results = files_with_texture(conn, args.texture)
+        else:
+            results = tow_flatbed_candidates(conn)
+
+        if args.json:
+            print(json.dumps(results, indent=4))
+        else:
+            for row in results:
+                print("  ".join(str(field) for field in row) if isinstance(row, tuple) else row)
+            print(f"[SUMMARY] Matches: {len(results)}")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
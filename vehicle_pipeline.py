@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Run several vehicle JSON maintenance transforms in a single pass over a pack.
+
+Each maintenance script (vehicle_damager, add_bodyroll_visibility,
+add_tow_flatbed, upholstery_conversion, replace_material_entries) walks the
+tree, parses every file and rewrites it on its own. This entry point discovers
+the files once, parses each once, applies the chosen passes in the order given
+and writes a file back only if at least one pass changed it, splicing the
+changes into the original text (see json_patch.py).
+
+Usage:
+    python vehicle_pipeline.py path/to/jsondefs --passes damage bodyroll tow_flatbed
+    python vehicle_pipeline.py path/to/jsondefs --passes materials --mapping paint_replacements.json --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import add_bodyroll_visibility
+import add_tow_flatbed
+import replace_material_entries
+import upholstery_conversion
+import vehicle_damager
+from json_io import load_json, write_summary
+from json_patch import write_json_patch
+
+# A pass takes the parsed document, the file's path relative to the root and the run options,
+# and returns (document, changed). Most passes edit the document in place and hand the same object back.
+TransformPass = Callable[[Any, str, argparse.Namespace], Tuple[Any, bool]]
+
+PASSES: Dict[str, TransformPass] = {}
+PASS_HELP: Dict[str, str] = {}
+
+
+def register_pass(name: str, help_text: str) -> Callable[[TransformPass], TransformPass]:
+    def decorator(fn: TransformPass) -> TransformPass:
+        PASSES[name] = fn
+        PASS_HELP[name] = help_text
+        return fn
+    return decorator
+
+
+# === Registered passes ===
+
+@register_pass("damage", "Add damage_totaled rotations to animated objects (vehicle_damager.py).")
+def damage_pass(data: Any, relative_path: str, options: argparse.Namespace) -> Tuple[Any, bool]:
+    rendering = data.get("rendering") if isinstance(data, dict) else None
+    if not isinstance(rendering, dict) or not isinstance(rendering.get("animatedObjects"), list):
+        return data, False
+    rng = vehicle_damager.file_rng(options.seed, relative_path)
+    added, removed = vehicle_damager.add_damage_animations(data, rng, log=None)
+    return data, bool(added or removed)
+
+
+@register_pass("bodyroll", "Add engine_running visibility to bodyroll modifiers (add_bodyroll_visibility.py).")
+def bodyroll_pass(data: Any, relative_path: str, options: argparse.Namespace) -> Tuple[Any, bool]:
+    return data, add_bodyroll_visibility.add_visibility_animations(data)
+
+
+@register_pass("tow_flatbed", "Insert missing tow_flatbed hookup connections (add_tow_flatbed.py).")
+def tow_flatbed_pass(data: Any, relative_path: str, options: argparse.Namespace) -> Tuple[Any, bool]:
+    return data, add_tow_flatbed.insert_tow_flatbed(data)
+
+
+@register_pass("upholstery", "Replace wool with upholstery piles in extra material lists (upholstery_conversion.py).")
+def upholstery_pass(data: Any, relative_path: str, options: argparse.Namespace) -> Tuple[Any, bool]:
+    if not isinstance(data, dict):
+        return data, False
+    return data, upholstery_conversion.convert_upholstery(data)
+
+
+@register_pass("materials", "Replace list entries using the --mapping file (replace_material_entries.py).")
+def materials_pass(data: Any, relative_path: str, options: argparse.Namespace) -> Tuple[Any, bool]:
+    updated, replacements_done = replace_material_entries.replace_in_json_node(data, options.replacements)
+    if replacements_done == 0:
+        return data, False
+    return updated, True
+
+
+# === Pipeline ===
+
+def run_passes(data: Any, relative_path: str, pass_names: List[str],
+               options: argparse.Namespace) -> Tuple[Any, List[str]]:
+    """Apply the passes in order; returns the final document and the names of the passes that changed it."""
+    applied: List[str] = []
+    for name in pass_names:
+        data, changed = PASSES[name](data, relative_path, options)
+        if changed:
+            applied.append(name)
+    return data, applied
+
+
+def process_file(path: Path, relative_path: str, pass_names: List[str],
+                 options: argparse.Namespace) -> Optional[List[str]]:
+    """Parse, transform and (unless dry-running) rewrite one file.
+
+    Returns the passes that changed it, or None if it could not be parsed or a pass
+    failed on it; a failed file is left untouched.
+    """
+    try:
+        data = load_json(path)
+    except Exception as e:
+        print(f"[WARN] JSON parse failed for {path}: {e}")
+        return None
+
+    try:
+        data, applied = run_passes(data, relative_path, pass_names, options)
+    except Exception as e:
+        print(f"[ERROR] {path}: {e}")
+        return None
+    if applied and not options.dry_run:
+        write_json_patch(path, data, ensure_ascii=False)
+    return applied
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Apply vehicle JSON transforms in one load-once, write-once pass.",
+        epilog="Passes: " + "; ".join(f"{name}: {text}" for name, text in PASS_HELP.items()),
+    )
+    parser.add_argument("root", help="Root directory to recursively scan for JSON files.")
+    parser.add_argument("--passes", nargs="+", required=True, choices=list(PASSES), metavar="PASS",
+                        help=f"Passes to apply, in order ({', '.join(PASSES)}).")
+    parser.add_argument("--mapping", default="./paint_replacements.json",
+                        help="Replacement mapping for the materials pass (default: ./paint_replacements.json).")
+    parser.add_argument("--pattern", default="*.json", help="Glob pattern for files under root (default: *.json).")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed for the damage pass; same seed and tree give the same axes as vehicle_damager.py.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing files.")
+    args = parser.parse_args(argv)
+
+    root_path = Path(args.root).resolve()
+    if not root_path.is_dir():
+        print(f"[ERROR] Root path is not a directory: {root_path}")
+        return 2
+
+    args.replacements = {}
+    if "materials" in args.passes:
+        mapping_path = Path(args.mapping).resolve()
+        if not mapping_path.is_file():
+            print(f"[ERROR] Mapping file not found: {mapping_path}")
+            return 2
+        args.replacements = replace_material_entries.load_mapping(mapping_path)
+
+    files = sorted(p for p in root_path.rglob(args.pattern) if p.is_file())
+    print(f"[INFO] Applying {', '.join(args.passes)} to {len(files)} JSON files under {root_path}")
+
+    per_pass = {name: 0 for name in args.passes}
+    modified = failed = 0
+    for path in files:
+        applied = process_file(path, path.relative_to(root_path).as_posix(), args.passes, args)
+        if applied is None:
+            failed += 1
+            continue
+        if applied:
+            modified += 1
+            for name in applied:
+                per_pass[name] += 1
+            tag = "DRY-RUN" if args.dry_run else "UPDATED"
+            print(f"[{tag}] {path} ({', '.join(applied)})")
+
+    print(f"[SUMMARY] Modified files: {modified}; Unchanged: {len(files) - modified - failed}; Failed: {failed}")
+    if not args.dry_run:
+        print(f"[SUMMARY] Writes: {write_summary()}")
+    print("[SUMMARY] Files changed per pass: " + "  ".join(f"{name}: {count}" for name, count in per_pass.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))